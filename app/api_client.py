@@ -1,7 +1,17 @@
 import reflex as rx
 import httpx
 import logging
-from app.config import BACKEND_API_URL
+import threading
+from contextlib import asynccontextmanager
+from app.config import (
+    BACKEND_API_URL,
+    BACKEND_HTTP_CONNECT_TIMEOUT,
+    BACKEND_HTTP_KEEPALIVE_EXPIRY,
+    BACKEND_HTTP_MAX_CONNECTIONS,
+    BACKEND_HTTP_MAX_KEEPALIVE,
+    BACKEND_HTTP_TIMEOUT,
+    BACKEND_TRANSPORT,
+)
 from typing import TypedDict
 import datetime
 
@@ -15,6 +25,11 @@ class Patient(TypedDict):
     user_id: int
 
 
+class PatientPage(TypedDict):
+    items: list[Patient]
+    next_cursor: str | None
+
+
 class UserInfo(TypedDict):
     id: int
     username: str
@@ -27,8 +42,134 @@ class LoginResponse(TypedDict):
     user: UserInfo
 
 
+class BackendHTTPPool:
+    """One keep-alive ``httpx.AsyncClient`` to the backend, shared process-wide.
+
+    The client is created on first use and closed by ``backend_http_lifespan``
+    when the app shuts down. Each request is traced so ``stats`` can report
+    how many requests reused a pooled connection versus opening a new one.
+
+    With ``in_process`` set, requests are dispatched straight into the
+    FastAPI app through ``httpx.ASGITransport`` instead of over the network,
+    for deployments running frontend and backend in one process.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        limits: httpx.Limits,
+        timeout: httpx.Timeout,
+        in_process: bool = False,
+    ):
+        self.base_url = base_url
+        self.limits = limits
+        self.timeout = timeout
+        self.in_process = in_process
+        self._client: httpx.AsyncClient | None = None
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._connections_opened = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            transport = None
+            if self.in_process:
+                transport = httpx.ASGITransport(app=_backend_app())
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=transport,
+            )
+        return self._client
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._connections_opened += 1
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            return await self.client.request(
+                method, url, extensions={"trace": self._trace}, **kwargs
+            )
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self._requests
+            reused = max(requests - self._connections_opened, 0)
+            return {
+                "transport": "asgi" if self.in_process else "http",
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "requests": requests,
+                "connections_opened": self._connections_opened,
+                "pool_hit_rate": reused / requests if requests else 0.0,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+            }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _backend_app():
+    from app.backend.main import app
+
+    return app
+
+
+backend_http_pool = BackendHTTPPool(
+    base_url=BACKEND_API_URL,
+    limits=httpx.Limits(
+        max_connections=BACKEND_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=BACKEND_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=BACKEND_HTTP_KEEPALIVE_EXPIRY,
+    ),
+    timeout=httpx.Timeout(
+        BACKEND_HTTP_TIMEOUT, connect=BACKEND_HTTP_CONNECT_TIMEOUT
+    ),
+    in_process=BACKEND_TRANSPORT == "asgi",
+)
+
+
+@asynccontextmanager
+async def backend_http_lifespan():
+    """App lifespan task that closes the shared backend connection pool.
+
+    In in-process mode it also runs the backend app's own lifespan, which
+    ``httpx.ASGITransport`` does not trigger.
+    """
+    try:
+        if backend_http_pool.in_process:
+            backend_app = _backend_app()
+            async with backend_app.router.lifespan_context(backend_app):
+                yield
+        else:
+            yield
+    finally:
+        await backend_http_pool.aclose()
+        logging.info("Backend HTTP pool closed")
+
+
 class APIClient:
-    """A stateless API client for backend communication."""
+    """A stateless API client for backend communication.
+
+    Instances are cheap: every instance sends its requests through the shared
+    ``backend_http_pool`` and only carries the caller's token.
+    """
 
     def __init__(self, token: str | None = None):
         """
@@ -37,7 +178,6 @@ class APIClient:
             token: The authentication token, if available.
         """
         self.token = token
-        self.client = httpx.AsyncClient(base_url=BACKEND_API_URL)
 
     async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
         """
@@ -47,7 +187,9 @@ class APIClient:
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
         try:
-            response = await self.client.request(method, url, headers=headers, **kwargs)
+            response = await backend_http_pool.request(
+                method, url, headers=headers, **kwargs
+            )
             response.raise_for_status()
             return response
         except httpx.HTTPStatusError as e:
@@ -61,8 +203,10 @@ class APIClient:
 
     async def login(self, username: str, password: str) -> LoginResponse:
         """Performs login and returns token and user info."""
-        response = await self.client.post(
-            "/api/auth/login", data={"username": username, "password": password}
+        response = await backend_http_pool.request(
+            "post",
+            "/api/auth/login",
+            data={"username": username, "password": password},
         )
         response.raise_for_status()
         return response.json()
@@ -79,7 +223,14 @@ class APIClient:
         response = await self._request("get", "/api/auth/me")
         return response.json()
 
-    async def get_patients(self) -> list[Patient]:
-        """Fetches a list of all patients."""
-        response = await self._request("get", "/api/patients")
+    async def get_patients(
+        self, limit: int = 50, cursor: str | None = None, search: str = ""
+    ) -> PatientPage:
+        """Fetches one page of patients, optionally filtered by a search prefix."""
+        params: dict[str, str | int] = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        if search:
+            params["q"] = search
+        response = await self._request("get", "/api/patients/", params=params)
         return response.json()
\ No newline at end of file
@@ -1,5 +1,9 @@
 import reflex as rx
-from app.auth import AuthState
+from fastapi import Depends, FastAPI
+from app.api_client import backend_http_lifespan, backend_http_pool
+from app.auth import AuthState, require_admin_token
+from app.states.admin_state import AdminState
+from app.states.slot_store import slot_registry
 
 
 def landing_page() -> rx.Component:
@@ -249,8 +253,56 @@ def admin_doctors_page() -> rx.Component:
     return admin_dashboard_layout(content)
 
 
+def _patient_row(patient: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(patient["name"], class_name="px-4 py-2 font-medium text-gray-800"),
+        rx.el.td(patient["email"], class_name="px-4 py-2 text-gray-600"),
+        rx.el.td(patient["phone"], class_name="px-4 py-2 text-gray-600"),
+        class_name="border-b hover:bg-gray-50",
+    )
+
+
 def admin_patients_page() -> rx.Component:
-    content = rx.el.h1("Patient Management")
+    content = rx.el.div(
+        rx.el.h1("Patient Management", class_name="text-3xl font-bold text-gray-800"),
+        rx.el.input(
+            placeholder="Search by name, email or phone",
+            default_value=AdminState.patient_search,
+            on_change=AdminState.search_patients.debounce(300),
+            class_name="w-full max-w-md p-2 border rounded-md text-sm mt-4",
+        ),
+        rx.el.div(
+            rx.el.table(
+                rx.el.thead(
+                    rx.el.tr(
+                        rx.el.th("Name", class_name="px-4 py-2 text-left"),
+                        rx.el.th("Email", class_name="px-4 py-2 text-left"),
+                        rx.el.th("Phone", class_name="px-4 py-2 text-left"),
+                        class_name="text-sm text-gray-500 border-b",
+                    )
+                ),
+                rx.el.tbody(rx.foreach(AdminState.patients, _patient_row)),
+                class_name="w-full text-sm",
+            ),
+            class_name="bg-white border rounded-lg shadow-sm overflow-x-auto mt-4",
+        ),
+        rx.el.div(
+            rx.el.button(
+                "Previous",
+                on_click=AdminState.previous_patients_page,
+                disabled=~AdminState.has_previous_patients | AdminState.is_loading,
+                class_name="px-4 py-2 bg-gray-200 text-gray-800 rounded-lg hover:bg-gray-300 disabled:opacity-50",
+            ),
+            rx.el.button(
+                "Next",
+                on_click=AdminState.next_patients_page,
+                disabled=~AdminState.has_next_patients | AdminState.is_loading,
+                class_name="px-4 py-2 bg-violet-600 text-white rounded-lg hover:bg-violet-700 disabled:opacity-50",
+            ),
+            class_name="flex justify-end gap-4 mt-4",
+        ),
+        class_name="p-6",
+    )
     return admin_dashboard_layout(content)
 
 
@@ -289,7 +341,20 @@ def placeholder_dashboard(title: str) -> rx.Component:
     )
 
 
+frontend_api = FastAPI()
+
+
+@frontend_api.get("/metrics")
+async def frontend_metrics(claims: dict = Depends(require_admin_token)):
+    """Runtime metrics of the frontend process for capacity planning (admin only)"""
+    return {
+        "backend_http": backend_http_pool.stats(),
+        "slot_registry": slot_registry.stats(),
+    }
+
+
 app = rx.App(
+    api_transformer=frontend_api,
     theme=rx.theme(appearance="light"),
     head_components=[
         rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
@@ -300,6 +365,7 @@ app = rx.App(
         ),
     ],
 )
+app.register_lifespan_task(backend_http_lifespan)
 app.add_page(landing_page, route="/", on_load=AuthState.check_auth)
 app.add_page(staff_login_page, route="/staff/login")
 app.add_page(patient_login_page, route="/patient/login")
@@ -311,7 +377,11 @@ app.add_page(
     admin_departments_page, route="/admin/departments", on_load=AuthState.check_auth
 )
 app.add_page(admin_doctors_page, route="/admin/doctors", on_load=AuthState.check_auth)
-app.add_page(admin_patients_page, route="/admin/patients", on_load=AuthState.check_auth)
+app.add_page(
+    admin_patients_page,
+    route="/admin/patients",
+    on_load=[AuthState.check_auth, AdminState.get_patients],
+)
 app.add_page(
     admin_appointments_page, route="/admin/appointments", on_load=AuthState.check_auth
 )
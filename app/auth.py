@@ -1,15 +1,47 @@
 import reflex as rx
 from typing import Any
 import logging
+import time
 import httpx
+import jwt
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from app.models import Role
 from app.api_client import APIClient
+from app.config import (
+    AUTH_CACHE_TTL_SECONDS,
+    AUTH_REVALIDATE_BEFORE_EXPIRY_SECONDS,
+    JWT_ALGORITHM,
+    SECRET_KEY,
+)
+
+
+def require_admin_token(
+    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+) -> dict:
+    """Require a valid admin access token on frontend API routes"""
+    try:
+        claims = jwt.decode(
+            credentials.credentials, SECRET_KEY, algorithms=[JWT_ALGORITHM]
+        )
+    except jwt.InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if claims.get("role") != Role.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
+        )
+    return claims
 
 
 class AuthState(rx.State):
     token: str = rx.Cookie("")
     user_info: dict[str, str | int] = {}
     is_loading: bool = False
+    _verified_until: float = 0.0
 
     @rx.var
     def is_authenticated(self) -> bool:
@@ -20,28 +52,61 @@ class AuthState(rx.State):
         role = self.user_info.get("role")
         return Role(role) if role else None
 
-    async def _update_user_info_from_token(self):
+    def _cache_verified_user(self, user_info: dict, trusted_until: float) -> None:
+        """Trust user_info until the cache TTL passes or ``trusted_until``"""
+        self.user_info = user_info
+        self._verified_until = min(time.time() + AUTH_CACHE_TTL_SECONDS, trusted_until)
+
+    async def _update_user_info_from_token(self, expires_at: float = 0.0):
         if not self.token:
             self.logout()
             return
         try:
             api_client = APIClient(token=self.token)
             user_data = await api_client.get_current_user()
-            self.user_info = user_data
+            self._cache_verified_user(user_data, expires_at)
         except (httpx.HTTPStatusError, ValueError) as e:
             logging.exception(f"Token validation failed, logging out: {e}")
             self.logout()
 
+    async def _verify_token(self):
+        """Validate the token signature and expiry locally.
+
+        The user is taken from the token claims, so no backend call is made
+        unless the token is close to expiry or predates the ``uid`` claim.
+        A user confirmed by the backend is trusted for the cache TTL too, but
+        never past the token's expiry.
+        """
+        if self.user_info and time.time() < self._verified_until:
+            return
+        try:
+            claims = jwt.decode(self.token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        except jwt.InvalidTokenError as e:
+            logging.info(f"Token rejected locally, logging out: {e}")
+            self.logout()
+            return
+        expires_at = float(claims.get("exp", 0))
+        if "uid" not in claims or (
+            expires_at - time.time() < AUTH_REVALIDATE_BEFORE_EXPIRY_SECONDS
+        ):
+            await self._update_user_info_from_token(expires_at)
+            return
+        self._cache_verified_user(
+            {"id": claims["uid"], "username": claims["sub"], "role": claims["role"]},
+            expires_at - AUTH_REVALIDATE_BEFORE_EXPIRY_SECONDS,
+        )
+
     @rx.event
     def logout(self):
         self.token = ""
         self.user_info = {}
+        self._verified_until = 0.0
         return rx.redirect("/")
 
     @rx.event
     async def check_auth(self):
-        if not self.is_authenticated and self.token:
-            await self._update_user_info_from_token()
+        if self.token:
+            await self._verify_token()
         current_path = self.router.page.path
         public_paths = ["/", "/staff/login", "/patient/login", "/patient/register"]
         auth_pages = ["/staff/login", "/patient/login", "/patient/register"]
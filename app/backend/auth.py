@@ -1,5 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
+import threading
+import time
 import jwt
 import bcrypt
 from fastapi import HTTPException, status, Depends
@@ -8,11 +12,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models import User, Role
 from .database import get_async_session
+from .cache import principal_cache
+from .loaders import RequestLoaders, get_loaders
+from .schemas import Principal
 import os
+import logging
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
+PASSWORD_HASH_MAX_CONCURRENCY = int(
+    os.getenv("PASSWORD_HASH_MAX_CONCURRENCY", str(os.cpu_count() or 4))
+)
 security = HTTPBearer()
 
 
@@ -26,6 +37,87 @@ def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
 
 
+class PasswordHasher:
+    """Runs bcrypt on a dedicated thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL while hashing, so the pool spreads bursts across
+    cores. At most ``max_concurrency`` hashes run at once; the rest wait in
+    the executor queue, whose depth is reported by ``stats``.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._peak_queue_depth = 0
+        self._completed = 0
+        self._total_wait_seconds = 0.0
+
+    def _track(self, fn, submitted_at: float, *args):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._total_wait_seconds += time.perf_counter() - submitted_at
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            self._queued += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queued)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._track, fn, time.perf_counter(), *args
+        )
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._submit(verify_password, password, hashed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_concurrency": self.max_concurrency,
+                "queue_depth": self._queued,
+                "peak_queue_depth": self._peak_queue_depth,
+                "running": self._running,
+                "completed": completed,
+                "avg_queue_wait_ms": (
+                    self._total_wait_seconds / completed * 1000 if completed else 0.0
+                ),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_MAX_CONCURRENCY)
+
+
+def build_token_claims(
+    user: User, patient_id: Optional[int] = None, doctor_id: Optional[int] = None
+) -> dict:
+    """Build access token claims, embedding the caller's role-profile IDs"""
+    return {
+        "sub": user.username,
+        "role": user.role.value,
+        "uid": user.id,
+        "patient_id": patient_id,
+        "doctor_id": doctor_id,
+    }
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -54,7 +146,7 @@ def verify_token(token: str) -> dict:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
         )
-    except jwt.JWTError as e:
+    except jwt.InvalidTokenError as e:
         logging.exception(f"Invalid JWT token: {e}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,16 +158,48 @@ async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_async_session),
 ) -> User:
-    """Get current user from JWT token"""
-    token = credentials.credentials
-    payload = verify_token(token)
-    username = payload.get("sub")
+    """Get current user from JWT token, served from the principal cache when warm"""
+    payload = verify_token(credentials.credentials)
+    return await _resolve_user(payload.get("sub"), db)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    loaders: RequestLoaders = Depends(get_loaders),
+) -> Principal:
+    """Get the current caller with role-profile IDs taken from the token claims"""
+    payload = verify_token(credentials.credentials)
+    user = await _resolve_user(payload.get("sub"), loaders.db)
+    patient_id = payload.get("patient_id")
+    doctor_id = payload.get("doctor_id")
+    # Tokens issued before the profile existed (or before the claims did) carry
+    # no profile IDs; only patients and doctors need them to be looked up.
+    if (
+        patient_id is None
+        and doctor_id is None
+        and user.role in (Role.PATIENT, Role.DOCTOR)
+    ):
+        patient_id, doctor_id = await loaders.profiles.load(user.id)
+    return Principal(
+        id=user.id,
+        username=user.username,
+        role=user.role,
+        patient_id=patient_id,
+        doctor_id=doctor_id,
+    )
+
+
+async def _resolve_user(username: str, db: AsyncSession) -> User:
+    user = principal_cache.get(username)
+    if user is not None:
+        return user
     result = await db.execute(select(User).where(User.username == username))
     user = result.scalar_one_or_none()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
+    principal_cache.set(username, user)
     return user
 
 
@@ -0,0 +1,137 @@
+"""Benchmark concurrent booking throughput on SQLite with and without the write queue.
+
+Usage: python -m app.backend.bench_bookings [--requests N] [--concurrency C]
+
+Each configuration runs in a fresh process against a fresh database file,
+because the engine and write queue are configured from the environment at
+import time. Bookings go through ``POST /api/appointments`` in-process.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+CONFIGURATIONS = {
+    "pooled writers": {"SQLITE_WRITE_QUEUE": "false"},
+    "write queue": {"SQLITE_WRITE_QUEUE": "true"},
+}
+
+
+async def run_bookings(requests: int, concurrency: int) -> dict:
+    import httpx
+    from app.backend.main import app
+    from app.backend.auth import create_access_token, hash_password
+    from app.backend.database import AsyncSessionLocal, database_pool_stats
+    from app.models import Doctor, Patient, Role, User
+
+    async with app.router.lifespan_context(app):
+        async with AsyncSessionLocal() as session:
+            admin = User(username="admin", password=hash_password("x"), role=Role.ADMIN)
+            session.add(admin)
+            await session.flush()
+            doctors = [
+                Doctor(
+                    name=f"Doctor {i}", specialization="General", user_id=admin.id
+                )
+                for i in range(concurrency)
+            ]
+            patient = Patient(
+                name="Patient", email="patient@example.com", user_id=admin.id
+            )
+            session.add_all([*doctors, patient])
+            await session.commit()
+            doctor_ids = [doctor.id for doctor in doctors]
+            patient_id = patient.id
+        token = create_access_token({"sub": "admin", "role": Role.ADMIN.value})
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+            headers={"Authorization": f"Bearer {token}"},
+        ) as client:
+            queue: asyncio.Queue = asyncio.Queue()
+            for n in range(requests):
+                queue.put_nowait(n)
+            statuses: dict = {}
+            latencies: list = []
+
+            async def worker() -> None:
+                while not queue.empty():
+                    n = queue.get_nowait()
+                    day, slot = divmod(n // len(doctor_ids), 48)
+                    start = f"{slot // 2:02d}:{slot % 2 * 30:02d}"
+                    end = f"{slot // 2:02d}:{slot % 2 * 30 + 29:02d}"
+                    started = time.perf_counter()
+                    response = await client.post(
+                        "/api/appointments/",
+                        params={"expand": ""},
+                        json={
+                            "date": f"2030-{1 + day // 28:02d}-{1 + day % 28:02d}",
+                            "start_time": start,
+                            "end_time": end,
+                            "doctor_id": doctor_ids[n % len(doctor_ids)],
+                            "patient_id": patient_id,
+                        },
+                    )
+                    latencies.append(time.perf_counter() - started)
+                    statuses[response.status_code] = (
+                        statuses.get(response.status_code, 0) + 1
+                    )
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+        latencies.sort()
+        pool = database_pool_stats()
+        return {
+            "bookings_per_second": round(requests / elapsed, 1),
+            "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+            "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 1),
+            "statuses": statuses,
+            "database_locked_errors": pool["database_locked_errors"],
+            "write_queue": pool.get("write_queue"),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        result = asyncio.run(run_bookings(args.requests, args.concurrency))
+        print(json.dumps(result))
+        return
+    for name, overrides in CONFIGURATIONS.items():
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                **overrides,
+                "DATABASE_URL": f"sqlite+aiosqlite:///{directory}/bench.db",
+                "DB_SCHEMA_MODE": "create_all",
+            }
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "app.backend.bench_bookings",
+                    "--child",
+                    f"--requests={args.requests}",
+                    f"--concurrency={args.concurrency}",
+                ],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        print(f"{name}: {output.strip().splitlines()[-1]}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
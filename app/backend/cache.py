@@ -0,0 +1,125 @@
+import hashlib
+import os
+import threading
+from typing import NamedTuple, Optional
+from cachetools import TTLCache
+from fastapi import Response, status
+from app.models import User
+
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAXSIZE = int(os.getenv("PRINCIPAL_CACHE_MAXSIZE", "10000"))
+CATALOG_CACHE_TTL_SECONDS = int(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+DOCTOR_CATALOG = "doctors"
+DEPARTMENT_CATALOG = "departments"
+
+
+class PrincipalCache:
+    """Bounded TTL cache of authenticated users keyed by token subject.
+
+    Entries are detached copies of the ``User`` row, so handlers never share
+    an ORM instance with another request's session. The TTL bounds how long a
+    change made by another worker process can go unnoticed.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[User]:
+        with self._lock:
+            cached = self._cache.get(subject)
+        if cached is None:
+            return None
+        return User.model_validate(cached)
+
+    def set(self, subject: str, user: User) -> None:
+        snapshot = {
+            "id": user.id,
+            "username": user.username,
+            "password": user.password,
+            "role": user.role,
+        }
+        with self._lock:
+            self._cache[subject] = snapshot
+
+    def invalidate(
+        self, subject: Optional[str] = None, user_id: Optional[int] = None
+    ) -> None:
+        """Drop cached entries matching a token subject and/or a user id."""
+        with self._lock:
+            if subject is not None:
+                self._cache.pop(subject, None)
+            if user_id is not None:
+                stale = [
+                    key
+                    for key, cached in self._cache.items()
+                    if cached["id"] == user_id
+                ]
+                for key in stale:
+                    self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+class CatalogEntry(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class CatalogCache:
+    """Pre-serialized JSON bodies of the public catalog listings.
+
+    Write handlers call ``invalidate`` for the catalogs they change. Cached
+    bodies carry a strong ETag derived from their content, so the tag agrees
+    across workers and ``If-None-Match`` revalidations can be answered with a
+    304. The TTL bounds how long a change made by another worker process can
+    go unnoticed.
+    """
+
+    def __init__(self, ttl: int):
+        self._cache: TTLCache = TTLCache(maxsize=64, ttl=ttl)
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[CatalogEntry]:
+        with self._lock:
+            return self._cache.get(name)
+
+    def version(self, name: str) -> int:
+        with self._lock:
+            return self._versions.get(name, 0)
+
+    def set(self, name: str, body: bytes, version: int) -> CatalogEntry:
+        """Cache a body built from data read at ``version``.
+
+        A body is dropped if the catalog was invalidated while it was built.
+        """
+        entry = CatalogEntry(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        with self._lock:
+            if self._versions.get(name, 0) == version:
+                self._cache[name] = entry
+        return entry
+
+    def invalidate(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._versions[name] = self._versions.get(name, 0) + 1
+                self._cache.pop(name, None)
+
+
+def catalog_response(entry: CatalogEntry, if_none_match: Optional[str]) -> Response:
+    """Answer with the cached body, or 304 if the client's ETag still matches"""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if if_none_match is not None:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in tags or entry.etag in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+principal_cache = PrincipalCache(
+    maxsize=PRINCIPAL_CACHE_MAXSIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS
+)
+catalog_cache = CatalogCache(ttl=CATALOG_CACHE_TTL_SECONDS)
\ No newline at end of file
@@ -1,29 +1,474 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from cachetools import TTLCache
+from fastapi import Depends, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+    async_sessionmaker,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import SQLModel
+from typing import Optional
+import asyncio
+import hashlib
+import itertools
 import os
 import logging
+import threading
+import time
+from .writer import CoordinatedAsyncSession, CoordinatedSession, SQLiteWriteCoordinator
 
 logger = logging.getLogger(__name__)
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./appointment_system.db")
-if DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
-AsyncSessionLocal = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+
+
+def _async_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+DATABASE_URL = _async_url(
+    os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./appointment_system.db")
+)
+DATABASE_REPLICA_URLS = [
+    _async_url(url.strip())
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+DB_REPLICA_HEALTH_CHECK_SECONDS = float(
+    os.getenv("DB_REPLICA_HEALTH_CHECK_SECONDS", "10")
+)
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+DB_SCHEMA_MODE = os.getenv("DB_SCHEMA_MODE", "migrate")
+ALEMBIC_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "alembic.ini")
+_IS_SQLITE = DATABASE_URL.startswith("sqlite")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.getenv(
+    "DB_POOL_PRE_PING", "false" if _IS_SQLITE else "true"
+).lower() in ("1", "true", "yes")
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+}
+
+
+class PoolMetrics:
+    """Checkout wait times, timeouts and lock errors of the connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._peak_checked_out = 0
+        self._timeouts = 0
+        self._locked_errors = 0
+        self._sessions = 0
+        self._checkins = 0
+        self._total_held_seconds = 0.0
+        self._max_held_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float, checked_out: int) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+            self._peak_checked_out = max(self._peak_checked_out, checked_out)
+
+    def record_session(self) -> None:
+        with self._lock:
+            self._sessions += 1
+
+    def record_checkin(self, held_seconds: float) -> None:
+        with self._lock:
+            self._checkins += 1
+            self._total_held_seconds += held_seconds
+            self._max_held_seconds = max(self._max_held_seconds, held_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def record_locked_error(self) -> None:
+        with self._lock:
+            self._locked_errors += 1
+
+    def stats(self, pool) -> dict:
+        checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+        capacity = DB_POOL_SIZE + DB_MAX_OVERFLOW
+        with self._lock:
+            checkouts = self._checkouts
+            checkins = self._checkins
+            return {
+                "pool_class": type(pool).__name__,
+                "pool_size": DB_POOL_SIZE,
+                "max_overflow": DB_MAX_OVERFLOW,
+                "checked_out": checked_out,
+                "saturation": checked_out / capacity if capacity else 0.0,
+                "peak_checked_out": self._peak_checked_out,
+                "checkouts": checkouts,
+                "avg_checkout_wait_ms": (
+                    self._total_wait_seconds / checkouts * 1000 if checkouts else 0.0
+                ),
+                "max_checkout_wait_ms": self._max_wait_seconds * 1000,
+                "checkout_timeouts": self._timeouts,
+                "sessions": self._sessions,
+                "avg_connection_held_ms": (
+                    self._total_held_seconds / checkins * 1000 if checkins else 0.0
+                ),
+                "max_connection_held_ms": self._max_held_seconds * 1000,
+                "database_locked_errors": self._locked_errors,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout waits and how long connections are held"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        checked_out_at = time.perf_counter()
+        pool_metrics.record_checkout(checked_out_at - started, self.checkedout())
+        connection.info["checked_out_at"] = checked_out_at
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            pool_metrics.record_checkin(time.perf_counter() - checked_out_at)
+        super()._do_return_conn(record)
+
+
+def _engine_options(url: str) -> dict:
+    """Pool settings for the URL; in-memory SQLite keeps its single static connection"""
+    database = make_url(url).database
+    if url.startswith("sqlite") and database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": MonitoredQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+engine = create_async_engine(
+    DATABASE_URL, echo=False, future=True, **_engine_options(DATABASE_URL)
+)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _count_locked_errors(context) -> None:
+    if "database is locked" in str(context.original_exception):
+        pool_metrics.record_locked_error()
+
+
+if _IS_SQLITE:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+
+SQLITE_WRITE_QUEUE = _IS_SQLITE and os.getenv(
+    "SQLITE_WRITE_QUEUE", "false"
+).lower() in ("1", "true", "yes")
+SQLITE_GROUP_COMMIT_WINDOW_MS = float(os.getenv("SQLITE_GROUP_COMMIT_WINDOW_MS", "0"))
+write_coordinator: Optional[SQLiteWriteCoordinator] = None
+if SQLITE_WRITE_QUEUE:
+    write_coordinator = SQLiteWriteCoordinator(
+        DATABASE_URL, SQLITE_GROUP_COMMIT_WINDOW_MS, _apply_sqlite_pragmas
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        engine,
+        class_=CoordinatedAsyncSession,
+        sync_session_class=CoordinatedSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+        write_coordinator=write_coordinator,
+    )
+else:
+    AsyncSessionLocal = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+
+class ReplicaRouter:
+    """Spreads reads over healthy replicas, falling back to the primary.
+
+    Callers that committed a write within ``sticky_seconds`` keep reading
+    from the primary, so they see their own writes despite replication lag.
+    """
+
+    def __init__(self, urls: list[str], primary: AsyncEngine, sticky_seconds: float):
+        self.primary = primary
+        self.replicas = [
+            create_async_engine(url, **_engine_options(url)) for url in urls
+        ]
+        self._healthy = set(range(len(self.replicas)))
+        self._turn = itertools.count()
+        self._recent_writers: TTLCache = TTLCache(
+            maxsize=100_000, ttl=max(sticky_seconds, 0.001)
+        )
+        self._lock = threading.Lock()
+        self._primary_reads = 0
+        self._replica_reads = 0
+        for index, replica in enumerate(self.replicas):
+            event.listen(
+                replica.sync_engine, "handle_error", self._disconnect_listener(index)
+            )
+
+    def _disconnect_listener(self, index: int):
+        def mark_unhealthy(context) -> None:
+            if context.is_disconnect:
+                self._set_health(index, False)
+
+        return mark_unhealthy
+
+    def _set_health(self, index: int, healthy: bool) -> None:
+        with self._lock:
+            changed = (index in self._healthy) != healthy
+            if healthy:
+                self._healthy.add(index)
+            else:
+                self._healthy.discard(index)
+        if changed:
+            logger.warning(
+                f"Read replica {index} is {'healthy' if healthy else 'unavailable'}"
+            )
+
+    def record_write(self, caller: str) -> None:
+        with self._lock:
+            self._recent_writers[caller] = True
+
+    def engine_for(self, caller: Optional[str]) -> AsyncEngine:
+        with self._lock:
+            healthy = sorted(self._healthy)
+            if not healthy or (caller is not None and caller in self._recent_writers):
+                self._primary_reads += 1
+                return self.primary
+            self._replica_reads += 1
+            return self.replicas[healthy[next(self._turn) % len(healthy)]]
+
+    async def check_health(self) -> None:
+        for index, replica in enumerate(self.replicas):
+            try:
+                async with replica.connect() as connection:
+                    await asyncio.wait_for(
+                        connection.execute(text("SELECT 1")),
+                        timeout=DB_REPLICA_HEALTH_CHECK_SECONDS,
+                    )
+            except Exception as e:
+                logger.debug(f"Health check of read replica {index} failed: {e}")
+                self._set_health(index, False)
+            else:
+                self._set_health(index, True)
+
+    async def run_health_checks(self) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(DB_REPLICA_HEALTH_CHECK_SECONDS)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "replicas": len(self.replicas),
+                "healthy_replicas": len(self._healthy),
+                "replica_reads": self._replica_reads,
+                "primary_reads": self._primary_reads,
+                "sticky_callers": len(self._recent_writers),
+            }
+
+
+replica_router = ReplicaRouter(
+    DATABASE_REPLICA_URLS, engine, sticky_seconds=DB_REPLICA_STICKY_SECONDS
 )
+_CALLER_KEY = "caller"
+_WROTE_KEY = "wrote"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_written(session: Session, flush_context) -> None:
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session) -> None:
+    caller = session.info.get(_CALLER_KEY)
+    if session.info.pop(_WROTE_KEY, False) and caller is not None:
+        replica_router.record_write(caller)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session: Session) -> None:
+    session.info.pop(_WROTE_KEY, None)
+
+
+def _caller(request: Request) -> Optional[str]:
+    authorization = request.headers.get("authorization")
+    if authorization is None:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+def database_pool_stats() -> dict:
+    stats = pool_metrics.stats(engine.pool)
+    if write_coordinator is not None:
+        stats["write_queue"] = write_coordinator.stats()
+    if replica_router.replicas:
+        stats["read_replicas"] = replica_router.stats()
+    return stats
+
+
+def _request_sessions(request: Request) -> list:
+    if not hasattr(request.state, "db_sessions"):
+        request.state.db_sessions = []
+    return request.state.db_sessions
 
 
-async def get_async_session() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
+async def _request_session(request: Request, **kwargs) -> AsyncSession:
+    async with AsyncSessionLocal(**kwargs) as session:
+        pool_metrics.record_session()
+        _request_sessions(request).append(session)
         try:
             yield session
         finally:
             await session.close()
 
 
+async def get_async_session(request: Request) -> AsyncSession:
+    """The request's session on the primary.
+
+    FastAPI caches the dependency, so authentication and the handler share one
+    session. It checks out a connection on its first query and gives it back
+    as soon as the handler returns (see ``DBSessionRoute``). Its commits pin
+    the caller's reads to the primary.
+    """
+    async for session in _request_session(request):
+        session.info[_CALLER_KEY] = _caller(request)
+        yield session
+
+
+def get_read_engine(request: Request) -> AsyncEngine:
+    """Engine for a read-only request: a healthy replica, or the primary"""
+    return replica_router.engine_for(_caller(request))
+
+
+async def get_read_session(
+    request: Request,
+    read_engine: AsyncEngine = Depends(get_read_engine),
+    db: AsyncSession = Depends(get_async_session),
+) -> AsyncSession:
+    """Read-only session for GET handlers that tolerate replication lag.
+
+    Reads routed to the primary reuse the request's primary session.
+    """
+    if read_engine is engine:
+        yield db
+        return
+    async for session in _request_session(request, bind=read_engine):
+        yield session
+
+
+class DBSessionRoute(APIRoute):
+    """Closes the request's sessions as soon as the handler has built its response.
+
+    Dependency teardown only runs after the response has been sent, so without
+    this, connections would stay checked out while the body is serialized and
+    written to the client. Handlers must therefore load everything a response
+    needs (including streamed rows) before returning it.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def handle_and_release(request: Request) -> Response:
+            try:
+                return await handler(request)
+            finally:
+                for session in _request_sessions(request):
+                    await session.close()
+
+        return handle_and_release
+
+
+def _run_migrations(connection) -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_CONFIG_PATH)
+    config.attributes["connection"] = connection
+    tables = set(inspect(connection).get_table_names())
+    if tables and "alembic_version" not in tables:
+        # Bootstrapped by create_all: it has the initial schema, and the later
+        # migrations skip the indexes and triggers it may already have.
+        logger.info("Stamping unversioned database at the initial revision")
+        command.stamp(config, "0001")
+    command.upgrade(config, "head")
+
+
+def _ensure_overlap_guard(connection) -> None:
+    """Refuse to start without the database-level double-booking guard.
+
+    create_all only installs it along with a new appointment table, so an
+    existing table gets it here. Migrated databases have it from 0003.
+    """
+    from app.models import APPOINTMENT_OVERLAP_DDL, APPOINTMENT_OVERLAP_GUARD_CHECKS
+
+    dialect = connection.dialect.name
+    if dialect not in APPOINTMENT_OVERLAP_GUARD_CHECKS:
+        return
+    query, expected = APPOINTMENT_OVERLAP_GUARD_CHECKS[dialect]
+    if connection.exec_driver_sql(query).scalar() == expected:
+        return
+    if DB_SCHEMA_MODE != "migrate":
+        for statement in APPOINTMENT_OVERLAP_DDL[dialect]:
+            connection.exec_driver_sql(statement)
+        if connection.exec_driver_sql(query).scalar() == expected:
+            return
+    raise RuntimeError(
+        "The appointment overlap guard is missing from the database; "
+        "apply the migrations up to head"
+    )
+
+
 async def init_db():
-    """Initialize database tables"""
+    """Initialize the database schema.
+
+    By default (``DB_SCHEMA_MODE=migrate``) the Alembic migrations are applied
+    up to head, so existing databases receive every schema change.
+    ``create_all`` only creates missing tables from the models.
+    """
     try:
         async with engine.begin() as conn:
             from app.models import (
@@ -35,8 +480,13 @@ async def init_db():
                 Availability,
             )
 
-            await conn.run_sync(SQLModel.metadata.create_all)
-        logger.info("Database tables created successfully")
+            if DB_SCHEMA_MODE == "migrate":
+                await conn.run_sync(_run_migrations)
+                logger.info("Database migrations applied successfully")
+            else:
+                await conn.run_sync(SQLModel.metadata.create_all)
+                logger.info("Database tables created successfully")
+            await conn.run_sync(_ensure_overlap_guard)
     except Exception as e:
         logging.exception(f"Error creating database tables: {e}")
         raise
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""Request-scoped batch loaders for doctors, patients, departments and profiles.
+
+Handlers queue the IDs they will need and then load them: every entity type
+is fetched with one ``IN`` query per batch, and results (including misses)
+are memoized for the rest of the request. Existence checks for a batch of
+doctor and patient references share a single query.
+"""
+
+from typing import Generic, Iterable, Optional, TypeVar
+from fastapi import Depends
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models import Department, Doctor, Patient
+from .database import get_async_session, get_read_session
+
+Entity = TypeVar("Entity")
+
+
+class EntityLoader(Generic[Entity]):
+    """Batches and memoizes primary-key lookups of one model"""
+
+    def __init__(self, db: AsyncSession, model: type[Entity]):
+        self.db = db
+        self.model = model
+        self._loaded: dict[int, Optional[Entity]] = {}
+        self._queued: set[int] = set()
+
+    def queue(self, ids: Iterable[int]) -> None:
+        """Collect IDs to fetch with the next load"""
+        self._queued.update(i for i in ids if i is not None and i not in self._loaded)
+
+    async def load_many(self, ids: Iterable[int]) -> dict[int, Entity]:
+        """Return the rows that exist among ``ids``, keyed by ID"""
+        ids = list(ids)
+        self.queue(ids)
+        if self._queued:
+            queued, self._queued = list(self._queued), set()
+            result = await self.db.execute(
+                select(self.model).where(self.model.id.in_(queued))
+            )
+            found = {row.id: row for row in result.scalars()}
+            for entity_id in queued:
+                self._loaded[entity_id] = found.get(entity_id)
+        return {
+            entity_id: self._loaded[entity_id]
+            for entity_id in ids
+            if self._loaded.get(entity_id) is not None
+        }
+
+    async def load(self, entity_id: int) -> Optional[Entity]:
+        return (await self.load_many([entity_id])).get(entity_id)
+
+    def resolved(self, ids: Iterable[int]) -> tuple[set[int], set[int]]:
+        """Split ``ids`` into those known to exist and those not loaded yet"""
+        found, unresolved = set(), set()
+        for entity_id in ids:
+            if entity_id not in self._loaded:
+                unresolved.add(entity_id)
+            elif self._loaded[entity_id] is not None:
+                found.add(entity_id)
+        return found, unresolved
+
+
+class ProfileLoader:
+    """Batches and memoizes user ID -> (patient_id, doctor_id) lookups"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._loaded: dict[int, tuple[Optional[int], Optional[int]]] = {}
+
+    async def load_many(
+        self, user_ids: Iterable[int]
+    ) -> dict[int, tuple[Optional[int], Optional[int]]]:
+        user_ids = list(user_ids)
+        missing = {i for i in user_ids if i not in self._loaded}
+        if missing:
+            result = await self.db.execute(
+                union_all(
+                    select(literal("patient"), Patient.user_id, Patient.id).where(
+                        Patient.user_id.in_(missing)
+                    ),
+                    select(literal("doctor"), Doctor.user_id, Doctor.id).where(
+                        Doctor.user_id.in_(missing)
+                    ),
+                )
+            )
+            profiles = {user_id: [None, None] for user_id in missing}
+            for kind, user_id, profile_id in result:
+                slot = 0 if kind == "patient" else 1
+                if profiles[user_id][slot] is None:
+                    profiles[user_id][slot] = profile_id
+            for user_id, (patient_id, doctor_id) in profiles.items():
+                self._loaded[user_id] = (patient_id, doctor_id)
+        return {user_id: self._loaded[user_id] for user_id in user_ids}
+
+    async def load(self, user_id: int) -> tuple[Optional[int], Optional[int]]:
+        return (await self.load_many([user_id]))[user_id]
+
+
+class RequestLoaders:
+    """The loaders of one request, all bound to the same session"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.doctors = EntityLoader(db, Doctor)
+        self.patients = EntityLoader(db, Patient)
+        self.departments = EntityLoader(db, Department)
+        self.profiles = ProfileLoader(db)
+
+    async def existing_references(
+        self, doctor_ids: Iterable[int], patient_ids: Iterable[int]
+    ) -> tuple[set[int], set[int]]:
+        """Return which doctor and patient IDs exist, checked in one query.
+
+        IDs the doctor and patient loaders already resolved are not queried.
+        """
+        doctors, unresolved_doctors = self.doctors.resolved(doctor_ids)
+        patients, unresolved_patients = self.patients.resolved(patient_ids)
+        if unresolved_doctors or unresolved_patients:
+            result = await self.db.execute(
+                union_all(
+                    select(literal("doctor"), Doctor.id).where(
+                        Doctor.id.in_(unresolved_doctors)
+                    ),
+                    select(literal("patient"), Patient.id).where(
+                        Patient.id.in_(unresolved_patients)
+                    ),
+                )
+            )
+            for kind, reference_id in result:
+                (doctors if kind == "doctor" else patients).add(reference_id)
+        return doctors, patients
+
+    async def attach_departments(self, doctors: Iterable[Doctor]) -> None:
+        """Fill ``Doctor.department`` for all the doctors with one batched load"""
+        doctors = list(doctors)
+        departments = await self.departments.load_many(
+            doctor.department_id for doctor in doctors
+        )
+        for doctor in doctors:
+            set_committed_value(
+                doctor, "department", departments.get(doctor.department_id)
+            )
+
+
+def get_loaders(db: AsyncSession = Depends(get_async_session)) -> RequestLoaders:
+    """Loaders on the request's primary session, for handlers that write"""
+    return RequestLoaders(db)
+
+
+def get_read_loaders(db: AsyncSession = Depends(get_read_session)) -> RequestLoaders:
+    """Loaders on the request's read session"""
+    return RequestLoaders(db)
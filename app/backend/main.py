@@ -2,9 +2,12 @@ from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import logging
-from .database import init_db
+from .database import init_db, replica_router, write_coordinator
+from .auth import password_hasher
+from .responses import FastJSONResponse
 from .routers import auth, patients, appointments, doctors, departments, admin
 
 logging.basicConfig(level=logging.INFO)
@@ -15,7 +18,16 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
+    health_checks = None
+    if replica_router.replicas:
+        health_checks = asyncio.create_task(replica_router.run_health_checks())
     yield
+    if health_checks is not None:
+        health_checks.cancel()
+        await replica_router.dispose()
+    if write_coordinator is not None:
+        await write_coordinator.stop()
+    password_hasher.shutdown()
     logger.info("Application shutting down")
 
 
@@ -24,6 +36,7 @@ app = FastAPI(
     description="A comprehensive appointment management system",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 CORS_ORIGINS = os.getenv(
     "CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000"
@@ -0,0 +1,106 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-11-03
+
+Mirrors the tables previously created by SQLModel.metadata.create_all.
+Databases that were bootstrapped that way should be stamped at this
+revision (``alembic stamp 0001``) before upgrading.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+role = sa.Enum("ADMIN", "DOCTOR", "PATIENT", name="role")
+appointment_status = sa.Enum(
+    "BOOKED", "CANCELLED", "COMPLETED", name="appointmentstatus"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "department",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+    )
+    op.create_index("ix_department_name", "department", ["name"], unique=True)
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("role", role, nullable=False),
+    )
+    op.create_index("ix_user_username", "user", ["username"], unique=True)
+    op.create_table(
+        "doctor",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("specialization", sa.String(), nullable=False),
+        sa.Column("contact_info", sa.String(), nullable=True),
+        sa.Column("google_calendar_id", sa.String(), nullable=True),
+        sa.Column(
+            "department_id",
+            sa.Integer(),
+            sa.ForeignKey("department.id"),
+            nullable=True,
+        ),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+    )
+    op.create_table(
+        "patient",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+    )
+    op.create_index("ix_patient_email", "patient", ["email"], unique=True)
+    op.create_table(
+        "appointment",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        sa.Column("status", appointment_status, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "doctor_id", sa.Integer(), sa.ForeignKey("doctor.id"), nullable=False
+        ),
+        sa.Column(
+            "patient_id", sa.Integer(), sa.ForeignKey("patient.id"), nullable=False
+        ),
+    )
+    op.create_table(
+        "availability",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("weekday", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        sa.Column("slot_duration", sa.Integer(), nullable=False),
+        sa.Column(
+            "doctor_id", sa.Integer(), sa.ForeignKey("doctor.id"), nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("availability")
+    op.drop_table("appointment")
+    op.drop_index("ix_patient_email", table_name="patient")
+    op.drop_table("patient")
+    op.drop_table("doctor")
+    op.drop_index("ix_user_username", table_name="user")
+    op.drop_table("user")
+    op.drop_index("ix_department_name", table_name="department")
+    op.drop_table("department")
+    appointment_status.drop(op.get_bind(), checkfirst=True)
+    role.drop(op.get_bind(), checkfirst=True)
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""indexes for the hot query shapes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-11-03
+
+Covers the foreign-key lookups used for authorization and the appointment
+listings, which filter by doctor or patient and order by (date, start_time).
+"""
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_doctor_user_id", "doctor", ["user_id"]),
+    ("ix_doctor_department_id", "doctor", ["department_id"]),
+    ("ix_patient_user_id", "patient", ["user_id"]),
+    (
+        "ix_appointment_doctor_id_date_start_time",
+        "appointment",
+        ["doctor_id", "date", "start_time"],
+    ),
+    (
+        "ix_appointment_patient_id_date_start_time",
+        "appointment",
+        ["patient_id", "date", "start_time"],
+    ),
+    ("ix_appointment_date_start_time_id", "appointment", ["date", "start_time", "id"]),
+    ("ix_appointment_status_date", "appointment", ["status", "date"]),
+    ("ix_availability_doctor_id_weekday", "availability", ["doctor_id", "weekday"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
\ No newline at end of file
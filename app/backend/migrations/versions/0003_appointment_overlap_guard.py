@@ -0,0 +1,65 @@
+"""reject overlapping booked appointments per doctor
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-11-03
+
+PostgreSQL gets an exclusion constraint over (doctor_id, time range) for
+BOOKED rows; SQLite, which serializes writers, gets BEFORE INSERT/UPDATE
+triggers performing the same check inside the writing transaction.
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+SQLITE_OVERLAP_CHECK = """
+    SELECT RAISE(ABORT, 'appointment_overlap')
+    WHERE NEW.status = 'BOOKED' AND EXISTS (
+        SELECT 1 FROM appointment
+        WHERE doctor_id = NEW.doctor_id
+          AND date = NEW.date
+          AND status = 'BOOKED'
+          AND start_time < NEW.end_time
+          AND end_time > NEW.start_time
+          {exclude_self}
+    );
+"""
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(
+            "ALTER TABLE appointment ADD CONSTRAINT appointment_overlap "
+            "EXCLUDE USING gist (doctor_id WITH =, "
+            'tsrange("date" + start_time, "date" + end_time) WITH &&) '
+            "WHERE (status = 'BOOKED')"
+        )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS appointment_overlap_insert "
+            "BEFORE INSERT ON appointment "
+            "BEGIN" + SQLITE_OVERLAP_CHECK.format(exclude_self="") + "END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS appointment_overlap_update "
+            "BEFORE UPDATE OF date, start_time, end_time, status, doctor_id "
+            "ON appointment "
+            "BEGIN"
+            + SQLITE_OVERLAP_CHECK.format(exclude_self="AND id != NEW.id")
+            + "END"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("ALTER TABLE appointment DROP CONSTRAINT appointment_overlap")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS appointment_overlap_update")
+        op.execute("DROP TRIGGER IF EXISTS appointment_overlap_insert")
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""indexes for the paged, searchable patient directory
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-11-04
+
+The directory is ordered by (lower(name), id) and searched by prefix on
+name, email and phone; prefixes are matched as ranges over lower(...) so
+the same expression indexes serve both SQLite and PostgreSQL.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_patient_lower_name_id", "patient", [sa.text("lower(name)"), "id"]),
+    ("ix_patient_lower_email", "patient", [sa.text("lower(email)")]),
+    ("ix_patient_phone", "patient", ["phone"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
\ No newline at end of file
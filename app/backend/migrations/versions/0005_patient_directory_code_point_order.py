@@ -0,0 +1,49 @@
+"""order the patient directory indexes by code point on PostgreSQL
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-11-06
+
+Prefix searches are matched as ranges, which are only exact under code point
+order. PostgreSQL's default locale collations are not, so the directory's
+expression indexes are rebuilt with COLLATE "C". SQLite already compares
+text by code point and keeps the 0004 indexes.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    (
+        "ix_patient_lower_name_id",
+        [sa.text('lower(name) COLLATE "C"'), "id"],
+        [sa.text("lower(name)"), "id"],
+    ),
+    (
+        "ix_patient_lower_email",
+        [sa.text('lower(email) COLLATE "C"')],
+        [sa.text("lower(email)")],
+    ),
+    ("ix_patient_phone", [sa.text('phone COLLATE "C"')], ["phone"]),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for name, columns, _ in INDEXES:
+        op.drop_index(name, table_name="patient")
+        op.create_index(name, "patient", columns)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for name, _, columns in INDEXES:
+        op.drop_index(name, table_name="patient")
+        op.create_index(name, "patient", columns)
@@ -0,0 +1,80 @@
+"""Fast JSON responses that validate each object once.
+
+Handlers build their pydantic models themselves, so returning them through
+``response_model`` would validate and serialize every object a second time.
+Returning one of these responses skips that pass, and the body is encoded
+by pydantic-core's serializer instead of ``json.dumps``.
+"""
+
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+from fastapi import Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic_core import to_json
+
+STREAM_CHUNK_ROWS = 256
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def json_response(content: Any, status_code: int = 200) -> FastJSONResponse:
+    """Encode models, dicts or lists of them without re-validating"""
+    return FastJSONResponse(content, status_code=status_code)
+
+
+def encoded_json_response(body: bytes, status_code: int = 200) -> Response:
+    """Send a body that was already encoded to JSON"""
+    return Response(
+        content=body, status_code=status_code, media_type="application/json"
+    )
+
+
+async def _encode_rows(
+    rows: Iterable, encode: Callable[[Any], bytes], prefix: bytes, suffix: bytes
+) -> AsyncIterator[bytes]:
+    chunk = [prefix]
+    separator = b""
+    for row in rows:
+        chunk.append(separator)
+        chunk.append(encode(row))
+        separator = b","
+        if len(chunk) >= 2 * STREAM_CHUNK_ROWS:
+            yield b"".join(chunk)
+            chunk = []
+    chunk.append(suffix)
+    yield b"".join(chunk)
+
+
+def stream_json_list(
+    rows: Iterable, encode: Callable[[Any], bytes]
+) -> StreamingResponse:
+    """Stream rows as a JSON array, encoding them a chunk at a time"""
+    return StreamingResponse(
+        _encode_rows(rows, encode, b"[", b"]"), media_type="application/json"
+    )
+
+
+def stream_json_page(
+    rows: Iterable, encode: Callable[[Any], bytes], next_cursor: Optional[str]
+) -> StreamingResponse:
+    """Stream a ``{"items": [...], "next_cursor": ...}`` page"""
+    return StreamingResponse(
+        _encode_rows(
+            rows,
+            encode,
+            b'{"items":[',
+            b'],"next_cursor":' + to_json(next_cursor) + b"}",
+        ),
+        media_type="application/json",
+    )
+
+
+def model_encoder(model: type) -> Callable[[Any], bytes]:
+    """Encoder validating an ORM row into ``model`` and serializing it to JSON"""
+
+    def encode(row: Any) -> bytes:
+        return to_json(model.model_validate(row))
+
+    return encode
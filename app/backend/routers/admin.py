@@ -1,14 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 import logging
-from app.models import User, Patient, Doctor, Appointment, AppointmentStatus, Role
-from ..database import get_async_session
-from ..auth import get_admin_user
+from app.models import User, Role
+from ..database import (
+    DBSessionRoute,
+    database_pool_stats,
+    get_async_session,
+    get_read_session,
+)
+from ..auth import get_admin_user, password_hasher
+from ..stats import dashboard_stats_cache, load_dashboard_stats
+from ..responses import json_response, model_encoder, stream_json_list
 from ..schemas import DashboardStats, UserResponse
 from typing import Optional
 
-router = APIRouter()
+router = APIRouter(route_class=DBSessionRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -17,34 +24,18 @@ async def get_dashboard_stats(
     current_user: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_async_session),
 ):
-    """Get dashboard statistics (admin only)"""
+    """Get dashboard statistics (admin only).
+
+    The snapshot is read from the primary: later writes are applied to it as
+    deltas, so it must not start out behind like a lagging replica can.
+    """
     try:
-        total_patients = await db.scalar(select(func.count(Patient.id)))
-        total_doctors = await db.scalar(select(func.count(Doctor.id)))
-        total_appointments = await db.scalar(select(func.count(Appointment.id)))
-        pending_appointments = await db.scalar(
-            select(func.count(Appointment.id)).where(
-                Appointment.status == AppointmentStatus.BOOKED
-            )
-        )
-        completed_appointments = await db.scalar(
-            select(func.count(Appointment.id)).where(
-                Appointment.status == AppointmentStatus.COMPLETED
-            )
-        )
-        cancelled_appointments = await db.scalar(
-            select(func.count(Appointment.id)).where(
-                Appointment.status == AppointmentStatus.CANCELLED
-            )
-        )
-        return DashboardStats(
-            total_patients=total_patients,
-            total_doctors=total_doctors,
-            total_appointments=total_appointments,
-            pending_appointments=pending_appointments,
-            completed_appointments=completed_appointments,
-            cancelled_appointments=cancelled_appointments,
-        )
+        stats = dashboard_stats_cache.get()
+        if stats is None:
+            generation = dashboard_stats_cache.generation()
+            stats = await load_dashboard_stats(db)
+            dashboard_stats_cache.set(stats, generation)
+        return json_response(DashboardStats(**stats))
     except Exception as e:
         logging.exception(f"Error fetching dashboard stats: {e}")
         raise HTTPException(
@@ -57,7 +48,7 @@ async def get_dashboard_stats(
 async def get_users(
     role: Optional[Role] = None,
     current_user: User = Depends(get_admin_user),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     """List all users with optional role filtering (admin only)"""
     try:
@@ -66,10 +57,19 @@ async def get_users(
             query = query.where(User.role == role)
         result = await db.execute(query)
         users = result.scalars().all()
-        return [UserResponse.model_validate(user) for user in users]
+        return stream_json_list(users, model_encoder(UserResponse))
     except Exception as e:
         logging.exception(f"Error fetching users: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not fetch users",
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/metrics")
+async def get_metrics(current_user: User = Depends(get_admin_user)):
+    """Runtime metrics for capacity planning (admin only)"""
+    return {
+        "password_hashing": password_hasher.stats(),
+        "database_pool": database_pool_stats(),
+    }
\ No newline at end of file
@@ -1,51 +1,400 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import noload, selectinload
+from collections import defaultdict
+from datetime import date, time
+from typing import AsyncIterator, Literal, NamedTuple, Optional
+import csv
+import io
 import logging
-from app.models import Appointment, Patient, Doctor, User, Role
-from ..database import get_async_session
-from ..auth import get_current_user, get_staff_user
-from ..schemas import AppointmentResponse, AppointmentCreate, AppointmentUpdate
+from app.models import (
+    APPOINTMENT_OVERLAP_CONSTRAINT,
+    Appointment,
+    AppointmentStatus,
+    Patient,
+    Doctor,
+    User,
+    Role,
+)
+from ..database import (
+    AsyncSessionLocal,
+    DBSessionRoute,
+    get_async_session,
+    get_read_engine,
+    get_read_session,
+)
+from ..pagination import encode_cursor, decode_cursor
+from ..responses import encoded_json_response, stream_json_page
+from ..auth import get_current_principal, get_staff_user
+from ..loaders import RequestLoaders, get_loaders
+from ..schemas import (
+    AppointmentResponse,
+    AppointmentBatchCreate,
+    AppointmentBatchResponse,
+    AppointmentBatchUpdate,
+    AppointmentCreate,
+    AppointmentPage,
+    AppointmentUpdate,
+    DoctorResponse,
+    Principal,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=DBSessionRoute)
 logger = logging.getLogger(__name__)
+MAX_PAGE_SIZE = 200
+APPOINTMENT_FIELDS = frozenset(AppointmentResponse.model_fields) - {"doctor", "patient"}
+APPOINTMENT_EXPANSIONS = ("doctor", "doctor.department", "patient")
+DOCTOR_FIELDS_WITHOUT_DEPARTMENT = frozenset(DoctorResponse.model_fields) - {
+    "department"
+}
+EXPORT_BATCH_ROWS = 1000
+EXPORT_FIELDS = (
+    "id",
+    "date",
+    "start_time",
+    "end_time",
+    "status",
+    "doctor_id",
+    "doctor_name",
+    "patient_id",
+    "patient_name",
+    "created_at",
+)
 
 
-@router.get("/", response_model=list[AppointmentResponse])
+class AppointmentView(NamedTuple):
+    """Which appointment fields and relationships a response carries"""
+
+    fields: frozenset
+    expand: frozenset
+
+    def loader_options(self) -> list:
+        """Eager-load the expanded relationships and skip the others entirely"""
+        if "doctor" not in self.expand:
+            doctor = noload(Appointment.doctor)
+        elif "doctor.department" in self.expand:
+            doctor = selectinload(Appointment.doctor).selectinload(Doctor.department)
+        else:
+            doctor = selectinload(Appointment.doctor).noload(Doctor.department)
+        if "patient" in self.expand:
+            patient = selectinload(Appointment.patient)
+        else:
+            patient = noload(Appointment.patient)
+        return [doctor, patient]
+
+    def encode(self, appointment: Appointment) -> bytes:
+        include: dict = dict.fromkeys(self.fields, True)
+        if "doctor.department" in self.expand:
+            include["doctor"] = True
+        elif "doctor" in self.expand:
+            # The department is not loaded; drop the key rather than send null.
+            include["doctor"] = DOCTOR_FIELDS_WITHOUT_DEPARTMENT
+        if "patient" in self.expand:
+            include["patient"] = True
+        return to_json(AppointmentResponse.model_validate(appointment), include=include)
+
+
+def _parse_names(value: str, allowed: frozenset | tuple, parameter: str) -> frozenset:
+    names = frozenset(name.strip() for name in value.split(",") if name.strip())
+    unknown = names.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {parameter}: {', '.join(sorted(unknown))}",
+        )
+    return names
+
+
+def get_appointment_view(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated appointment fields to return"
+    ),
+    expand: Optional[str] = Query(
+        None,
+        description="Comma-separated relationships to embed: "
+        "doctor, doctor.department, patient. Defaults to all of them",
+    ),
+) -> AppointmentView:
+    """Parse ?fields= and ?expand=; ``id`` is always returned"""
+    selected = APPOINTMENT_FIELDS
+    if fields is not None:
+        selected = _parse_names(fields, APPOINTMENT_FIELDS, "fields") | {"id"}
+    expanded = frozenset(APPOINTMENT_EXPANSIONS)
+    if expand is not None:
+        expanded = _parse_names(expand, APPOINTMENT_EXPANSIONS, "expand")
+        if "doctor.department" in expanded:
+            expanded |= {"doctor"}
+    return AppointmentView(selected, expanded)
+
+
+def _decode_appointment_cursor(cursor: str) -> tuple[date, time, int]:
+    after_date, after_time, after_id = decode_cursor(cursor, 3)
+    try:
+        return (
+            date.fromisoformat(after_date),
+            time.fromisoformat(after_time),
+            int(after_id),
+        )
+    except (TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from e
+
+
+async def _load_with_relations(
+    db: AsyncSession, appointment_id: int, view: AppointmentView
+) -> Appointment:
+    result = await db.execute(
+        select(Appointment)
+        .options(*view.loader_options())
+        .where(Appointment.id == appointment_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def _has_conflict(
+    db: AsyncSession,
+    doctor_id: int,
+    on_date: date,
+    start_time: time,
+    end_time: time,
+    exclude_id: Optional[int] = None,
+) -> bool:
+    """Check for a booked appointment of the doctor overlapping the given range.
+
+    This only short-circuits the common case; the database constraint
+    (see APPOINTMENT_OVERLAP_DDL) is what makes concurrent bookings safe.
+    """
+    query = select(Appointment.id).where(
+        Appointment.doctor_id == doctor_id,
+        Appointment.date == on_date,
+        Appointment.status == AppointmentStatus.BOOKED,
+        Appointment.start_time < end_time,
+        Appointment.end_time > start_time,
+    )
+    if exclude_id is not None:
+        query = query.where(Appointment.id != exclude_id)
+    result = await db.execute(query.limit(1))
+    return result.first() is not None
+
+
+def _is_overlap_violation(error: IntegrityError) -> bool:
+    return APPOINTMENT_OVERLAP_CONSTRAINT in str(error.orig)
+
+
+def _slot_taken() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Doctor is already booked for this time",
+    )
+
+
+def _validate_time_range(start_time: time, end_time: time) -> None:
+    if end_time <= start_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_time must be after start_time",
+        )
+
+
+async def _commit_booking(db: AsyncSession, flush_only: bool = False) -> None:
+    """Commit (or just flush), turning an overlap constraint violation into a 409"""
+    try:
+        if flush_only:
+            await db.flush()
+        else:
+            await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_overlap_violation(e):
+            raise _slot_taken() from e
+        raise
+
+
+async def _create_each(
+    db: AsyncSession,
+    items: list[AppointmentCreate],
+    indexes: list[int],
+    rejected: list[tuple[int, int, str]],
+) -> list[tuple[int, Appointment]]:
+    """Insert each item under its own SAVEPOINT, rejecting those that overlap"""
+    created = []
+    for index in indexes:
+        appointment = Appointment(**items[index].model_dump())
+        try:
+            async with db.begin_nested():
+                db.add(appointment)
+        except IntegrityError as e:
+            if not _is_overlap_violation(e):
+                raise
+            taken = _slot_taken()
+            rejected.append((index, taken.status_code, taken.detail))
+            continue
+        created.append((index, appointment))
+    if created:
+        await _commit_booking(db)
+    return created
+
+
+def _can_access(principal: Principal, appointment: Appointment) -> bool:
+    """Check appointment ownership against the profile IDs carried by the token"""
+    if principal.role == Role.PATIENT:
+        return (
+            principal.patient_id is not None
+            and appointment.patient_id == principal.patient_id
+        )
+    if principal.role == Role.DOCTOR:
+        return (
+            principal.doctor_id is not None
+            and appointment.doctor_id == principal.doctor_id
+        )
+    return True
+
+
+async def _booked_intervals(
+    db: AsyncSession, keys: set[tuple[int, date]]
+) -> defaultdict:
+    """Booked (start, end) times by appointment ID for each (doctor_id, date)"""
+    booked = defaultdict(dict)
+    if not keys:
+        return booked
+    result = await db.execute(
+        select(
+            Appointment.id,
+            Appointment.doctor_id,
+            Appointment.date,
+            Appointment.start_time,
+            Appointment.end_time,
+        ).where(
+            Appointment.status == AppointmentStatus.BOOKED,
+            tuple_(Appointment.doctor_id, Appointment.date).in_(keys),
+        )
+    )
+    for row in result:
+        booked[(row.doctor_id, row.date)][row.id] = (row.start_time, row.end_time)
+    return booked
+
+
+def _overlaps(
+    intervals: dict, start_time: time, end_time: time, exclude_id: Optional[int] = None
+) -> bool:
+    return any(
+        other_id != exclude_id and other_start < end_time and other_end > start_time
+        for other_id, (other_start, other_end) in intervals.items()
+    )
+
+
+async def _batch_response(
+    db: AsyncSession,
+    view: AppointmentView,
+    accepted: list[tuple[int, int]],
+    rejected: list[tuple[int, int, str]],
+    success_status: int,
+) -> Response:
+    """Encode per-item results, loading every accepted appointment in one query"""
+    appointments = {}
+    if accepted:
+        accepted_ids = [appointment_id for _, appointment_id in accepted]
+        result = await db.execute(
+            select(Appointment)
+            .options(*view.loader_options())
+            .where(Appointment.id.in_(accepted_ids))
+            .execution_options(populate_existing=True)
+        )
+        appointments = {appointment.id: appointment for appointment in result.scalars()}
+    results = {
+        index: b'{"index":%d,"status":%d,"appointment":%s}'
+        % (index, success_status, view.encode(appointments[appointment_id]))
+        for index, appointment_id in accepted
+    }
+    for index, status_code, detail in rejected:
+        results[index] = to_json(
+            {"index": index, "status": status_code, "detail": detail}
+        )
+    return encoded_json_response(
+        b'{"results":[' + b",".join(results[i] for i in sorted(results)) + b"]}"
+    )
+
+
+def _apply_filters(
+    query,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    status_filter: Optional[AppointmentStatus],
+    doctor_id: Optional[int],
+    department_id: Optional[int] = None,
+):
+    if date_from is not None:
+        query = query.where(Appointment.date >= date_from)
+    if date_to is not None:
+        query = query.where(Appointment.date <= date_to)
+    if status_filter is not None:
+        query = query.where(Appointment.status == status_filter)
+    if doctor_id is not None:
+        query = query.where(Appointment.doctor_id == doctor_id)
+    if department_id is not None:
+        query = query.where(
+            Appointment.doctor_id.in_(
+                select(Doctor.id).where(Doctor.department_id == department_id)
+            )
+        )
+    return query
+
+
+@router.get("/", response_model=AppointmentPage)
 async def get_appointments(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_session),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status_filter: Optional[AppointmentStatus] = Query(None, alias="status"),
+    doctor_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    view: AppointmentView = Depends(get_appointment_view),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    """Get appointments based on user role"""
+    """Get a page of appointments based on user role, ordered by (date, start_time, id)"""
     try:
-        query = select(Appointment).options(
-            selectinload(Appointment.doctor), selectinload(Appointment.patient)
+        query = select(Appointment).options(*view.loader_options())
+        if principal.role == Role.PATIENT:
+            if principal.patient_id is None:
+                return AppointmentPage(items=[])
+            query = query.where(Appointment.patient_id == principal.patient_id)
+        elif principal.role == Role.DOCTOR:
+            if principal.doctor_id is None:
+                return AppointmentPage(items=[])
+            query = query.where(Appointment.doctor_id == principal.doctor_id)
+        query = _apply_filters(
+            query, date_from, date_to, status_filter, doctor_id, department_id
         )
-        if current_user.role == Role.PATIENT:
-            patient_result = await db.execute(
-                select(Patient).where(Patient.user_id == current_user.id)
+        if cursor:
+            after_date, after_time, after_id = _decode_appointment_cursor(cursor)
+            query = query.where(
+                tuple_(Appointment.date, Appointment.start_time, Appointment.id)
+                > tuple_(after_date, after_time, after_id)
             )
-            patient = patient_result.scalar_one_or_none()
-            if patient:
-                query = query.where(Appointment.patient_id == patient.id)
-            else:
-                return []
-        elif current_user.role == Role.DOCTOR:
-            doctor_result = await db.execute(
-                select(Doctor).where(Doctor.user_id == current_user.id)
-            )
-            doctor = doctor_result.scalar_one_or_none()
-            if doctor:
-                query = query.where(Appointment.doctor_id == doctor.id)
-            else:
-                return []
+        query = query.order_by(
+            Appointment.date, Appointment.start_time, Appointment.id
+        ).limit(limit + 1)
         result = await db.execute(query)
         appointments = result.scalars().all()
-        return [
-            AppointmentResponse.model_validate(appointment)
-            for appointment in appointments
-        ]
+        next_cursor = None
+        if len(appointments) > limit:
+            appointments = appointments[:limit]
+            last = appointments[-1]
+            next_cursor = encode_cursor(
+                [last.date.isoformat(), last.start_time.isoformat(), last.id]
+            )
+        return stream_json_page(appointments, view.encode, next_cursor)
+    except HTTPException as e:
+        logging.exception(f"HTTP Exception in get_appointments: {e}")
+        raise
     except Exception as e:
         logging.exception(f"Error fetching appointments: {e}")
         raise HTTPException(
@@ -54,45 +403,141 @@ async def get_appointments(
         )
 
 
+async def _export_batches(query, bind: AsyncEngine) -> AsyncIterator[list]:
+    """Yield result rows in batches from a server-side cursor.
+
+    The stream owns its session, since it outlives the request handler.
+    """
+    async with AsyncSessionLocal(bind=bind) as session:
+        result = await session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_ROWS)
+        )
+        async for batch in result.partitions():
+            yield batch
+
+
+async def _export_ndjson(query, bind: AsyncEngine) -> AsyncIterator[bytes]:
+    async for batch in _export_batches(query, bind):
+        yield b"".join(to_json(row._asdict()) + b"\n" for row in batch)
+
+
+async def _export_csv(query, bind: AsyncEngine) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    async for batch in _export_batches(query, bind):
+        writer.writerows(
+            [
+                row.id,
+                row.date.isoformat(),
+                row.start_time.isoformat(),
+                row.end_time.isoformat(),
+                AppointmentStatus(row.status).value,
+                row.doctor_id,
+                row.doctor_name,
+                row.patient_id,
+                row.patient_name,
+                row.created_at.isoformat(),
+            ]
+            for row in batch
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get("/export")
+async def export_appointments(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status_filter: Optional[AppointmentStatus] = Query(None, alias="status"),
+    doctor_id: Optional[int] = None,
+    principal: Principal = Depends(get_current_principal),
+    read_engine: AsyncEngine = Depends(get_read_engine),
+):
+    """Stream appointments as NDJSON or CSV in constant memory (staff only).
+
+    Doctors only export their own appointments.
+    """
+    if principal.role == Role.PATIENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Staff access required"
+        )
+    query = (
+        select(
+            Appointment.id,
+            Appointment.date,
+            Appointment.start_time,
+            Appointment.end_time,
+            Appointment.status,
+            Appointment.doctor_id,
+            Doctor.name.label("doctor_name"),
+            Appointment.patient_id,
+            Patient.name.label("patient_name"),
+            Appointment.created_at,
+        )
+        .join(Doctor, Doctor.id == Appointment.doctor_id)
+        .join(Patient, Patient.id == Appointment.patient_id)
+    )
+    if principal.role == Role.DOCTOR:
+        query = query.where(Appointment.doctor_id == principal.doctor_id)
+    query = _apply_filters(query, date_from, date_to, status_filter, doctor_id)
+    query = query.order_by(Appointment.date, Appointment.start_time, Appointment.id)
+    if export_format == "csv":
+        body, media_type = _export_csv(query, read_engine), "text/csv"
+    else:
+        body = _export_ndjson(query, read_engine)
+        media_type = "application/x-ndjson"
+    filename = f"appointments.{export_format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.post("/", response_model=AppointmentResponse)
 async def create_appointment(
     appointment_data: AppointmentCreate,
-    current_user: User = Depends(get_current_user),
+    view: AppointmentView = Depends(get_appointment_view),
+    principal: Principal = Depends(get_current_principal),
+    loaders: RequestLoaders = Depends(get_loaders),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Create new appointment"""
     try:
-        doctor_result = await db.execute(
-            select(Doctor).where(Doctor.id == appointment_data.doctor_id)
-        )
-        doctor = doctor_result.scalar_one_or_none()
+        doctor = await loaders.doctors.load(appointment_data.doctor_id)
         if not doctor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
             )
-        if current_user.role == Role.PATIENT:
-            patient_result = await db.execute(
-                select(Patient).where(Patient.user_id == current_user.id)
-            )
-            patient = patient_result.scalar_one_or_none()
-            if not patient or patient.id != appointment_data.patient_id:
+        if principal.role == Role.PATIENT:
+            if principal.patient_id != appointment_data.patient_id:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Can only book appointments for yourself",
                 )
-        patient_result = await db.execute(
-            select(Patient).where(Patient.id == appointment_data.patient_id)
-        )
-        patient = patient_result.scalar_one_or_none()
+        patient = await loaders.patients.load(appointment_data.patient_id)
         if not patient:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
             )
+        _validate_time_range(appointment_data.start_time, appointment_data.end_time)
+        if await _has_conflict(
+            db,
+            appointment_data.doctor_id,
+            appointment_data.date,
+            appointment_data.start_time,
+            appointment_data.end_time,
+        ):
+            raise _slot_taken()
         appointment = Appointment(**appointment_data.model_dump())
         db.add(appointment)
-        await db.commit()
-        await db.refresh(appointment, ["doctor", "patient"])
-        return AppointmentResponse.model_validate(appointment)
+        await _commit_booking(db)
+        appointment = await _load_with_relations(db, appointment.id, view)
+        return encoded_json_response(view.encode(appointment))
     except HTTPException as e:
         logging.exception(f"HTTP Exception in create_appointment: {e}")
         raise
@@ -105,19 +550,192 @@ async def create_appointment(
         )
 
 
+@router.post("/batch", response_model=AppointmentBatchResponse)
+async def create_appointments_batch(
+    batch: AppointmentBatchCreate,
+    view: AppointmentView = Depends(get_appointment_view),
+    principal: Principal = Depends(get_current_principal),
+    loaders: RequestLoaders = Depends(get_loaders),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Create many appointments in one transaction.
+
+    Items are checked in order against existing bookings and the accepted
+    items before them. Rejected items are reported with a status and detail
+    and do not stop the others. If a concurrent booking takes a slot after
+    the checks, the accepted items are inserted again one by one so that only
+    the conflicting ones are rejected.
+    """
+    try:
+        items = batch.items
+        doctors, patients = await loaders.existing_references(
+            {item.doctor_id for item in items}, {item.patient_id for item in items}
+        )
+        booked = await _booked_intervals(
+            db, {(item.doctor_id, item.date) for item in items}
+        )
+        created, rejected = [], []
+        for index, item in enumerate(items):
+            intervals = booked[(item.doctor_id, item.date)]
+            try:
+                if item.doctor_id not in doctors:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Doctor not found",
+                    )
+                if (
+                    principal.role == Role.PATIENT
+                    and principal.patient_id != item.patient_id
+                ):
+                    raise HTTPException(
+                        status_code=status.HTTP_403_FORBIDDEN,
+                        detail="Can only book appointments for yourself",
+                    )
+                if item.patient_id not in patients:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Patient not found",
+                    )
+                _validate_time_range(item.start_time, item.end_time)
+                if _overlaps(intervals, item.start_time, item.end_time):
+                    raise _slot_taken()
+            except HTTPException as e:
+                rejected.append((index, e.status_code, e.detail))
+                continue
+            intervals[-1 - index] = (item.start_time, item.end_time)
+            appointment = Appointment(**item.model_dump())
+            db.add(appointment)
+            created.append((index, appointment))
+        if created:
+            try:
+                await db.commit()
+            except IntegrityError as e:
+                await db.rollback()
+                if not _is_overlap_violation(e):
+                    raise
+                created = await _create_each(
+                    db, items, [index for index, _ in created], rejected
+                )
+        return await _batch_response(
+            db,
+            view,
+            [(index, appointment.id) for index, appointment in created],
+            rejected,
+            status.HTTP_201_CREATED,
+        )
+    except HTTPException as e:
+        logging.exception(f"HTTP Exception in create_appointments_batch: {e}")
+        raise
+    except Exception as e:
+        logging.exception(f"Error creating appointments batch: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not create appointments",
+        )
+
+
+@router.put("/batch", response_model=AppointmentBatchResponse)
+async def update_appointments_batch(
+    batch: AppointmentBatchUpdate,
+    view: AppointmentView = Depends(get_appointment_view),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Update many appointments in one transaction.
+
+    Items are applied in order, so an appointment can move into a slot that
+    an earlier item in the batch vacated. Rejected items are reported with a
+    status and detail and do not stop the others.
+    """
+    try:
+        items = batch.items
+        result = await db.execute(
+            select(Appointment).where(Appointment.id.in_({item.id for item in items}))
+        )
+        appointments = {appointment.id: appointment for appointment in result.scalars()}
+        booked = await _booked_intervals(
+            db,
+            {
+                (appointment.doctor_id, item.date or appointment.date)
+                for item in items
+                if (appointment := appointments.get(item.id)) is not None
+            },
+        )
+        updated_ids, accepted, rejected = set(), [], []
+        for index, item in enumerate(items):
+            appointment = appointments.get(item.id)
+            update_data = item.model_dump(exclude_unset=True, exclude={"id"})
+            try:
+                if appointment is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Appointment not found",
+                    )
+                if item.id in updated_ids:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Appointment appears more than once in the batch",
+                    )
+                if not _can_access(principal, appointment):
+                    raise HTTPException(
+                        status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
+                    )
+                updated = {
+                    field: update_data.get(field, getattr(appointment, field))
+                    for field in ("date", "start_time", "end_time", "status")
+                }
+                _validate_time_range(updated["start_time"], updated["end_time"])
+                intervals = booked[(appointment.doctor_id, updated["date"])]
+                if updated["status"] == AppointmentStatus.BOOKED and _overlaps(
+                    intervals,
+                    updated["start_time"],
+                    updated["end_time"],
+                    exclude_id=appointment.id,
+                ):
+                    raise _slot_taken()
+            except HTTPException as e:
+                rejected.append((index, e.status_code, e.detail))
+                continue
+            booked.get((appointment.doctor_id, appointment.date), {}).pop(
+                appointment.id, None
+            )
+            if updated["status"] == AppointmentStatus.BOOKED:
+                intervals[appointment.id] = (updated["start_time"], updated["end_time"])
+            for field, value in update_data.items():
+                setattr(appointment, field, value)
+            # Flush each item so the overlap constraint sees the same order as
+            # the checks above rather than the session's primary-key order.
+            await _commit_booking(db, flush_only=True)
+            updated_ids.add(appointment.id)
+            accepted.append((index, appointment.id))
+        if accepted:
+            await _commit_booking(db)
+        return await _batch_response(db, view, accepted, rejected, status.HTTP_200_OK)
+    except HTTPException as e:
+        logging.exception(f"HTTP Exception in update_appointments_batch: {e}")
+        raise
+    except Exception as e:
+        logging.exception(f"Error updating appointments batch: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not update appointments",
+        )
+
+
 @router.get("/{appointment_id}", response_model=AppointmentResponse)
 async def get_appointment(
     appointment_id: int,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_session),
+    view: AppointmentView = Depends(get_appointment_view),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_session),
 ):
     """Get appointment by ID"""
     try:
         result = await db.execute(
             select(Appointment)
-            .options(
-                selectinload(Appointment.doctor), selectinload(Appointment.patient)
-            )
+            .options(*view.loader_options())
             .where(Appointment.id == appointment_id)
         )
         appointment = result.scalar_one_or_none()
@@ -125,25 +743,11 @@ async def get_appointment(
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found"
             )
-        if current_user.role == Role.PATIENT:
-            patient_result = await db.execute(
-                select(Patient).where(Patient.user_id == current_user.id)
-            )
-            patient = patient_result.scalar_one_or_none()
-            if not patient or appointment.patient_id != patient.id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
-                )
-        elif current_user.role == Role.DOCTOR:
-            doctor_result = await db.execute(
-                select(Doctor).where(Doctor.user_id == current_user.id)
+        if not _can_access(principal, appointment):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
             )
-            doctor = doctor_result.scalar_one_or_none()
-            if not doctor or appointment.doctor_id != doctor.id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
-                )
-        return AppointmentResponse.model_validate(appointment)
+        return encoded_json_response(view.encode(appointment))
     except HTTPException as e:
         logging.exception(f"HTTP Exception in get_appointment: {e}")
         raise
@@ -159,7 +763,8 @@ async def get_appointment(
 async def update_appointment(
     appointment_id: int,
     appointment_update: AppointmentUpdate,
-    current_user: User = Depends(get_current_user),
+    view: AppointmentView = Depends(get_appointment_view),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Update appointment"""
@@ -172,30 +777,30 @@ async def update_appointment(
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found"
             )
-        if current_user.role == Role.PATIENT:
-            patient_result = await db.execute(
-                select(Patient).where(Patient.user_id == current_user.id)
-            )
-            patient = patient_result.scalar_one_or_none()
-            if not patient or appointment.patient_id != patient.id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
-                )
-        elif current_user.role == Role.DOCTOR:
-            doctor_result = await db.execute(
-                select(Doctor).where(Doctor.user_id == current_user.id)
+        if not _can_access(principal, appointment):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
             )
-            doctor = doctor_result.scalar_one_or_none()
-            if not doctor or appointment.doctor_id != doctor.id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
-                )
         update_data = appointment_update.model_dump(exclude_unset=True)
+        updated = {
+            field: update_data.get(field, getattr(appointment, field))
+            for field in ("date", "start_time", "end_time", "status")
+        }
+        _validate_time_range(updated["start_time"], updated["end_time"])
+        if updated["status"] == AppointmentStatus.BOOKED and await _has_conflict(
+            db,
+            appointment.doctor_id,
+            updated["date"],
+            updated["start_time"],
+            updated["end_time"],
+            exclude_id=appointment.id,
+        ):
+            raise _slot_taken()
         for field, value in update_data.items():
             setattr(appointment, field, value)
-        await db.commit()
-        await db.refresh(appointment, ["doctor", "patient"])
-        return AppointmentResponse.model_validate(appointment)
+        await _commit_booking(db)
+        appointment = await _load_with_relations(db, appointment.id, view)
+        return encoded_json_response(view.encode(appointment))
     except HTTPException as e:
         logging.exception(f"HTTP Exception in update_appointment: {e}")
         raise
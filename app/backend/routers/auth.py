@@ -4,12 +4,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import timedelta
 import logging
-from app.models import User, Role, Patient
-from ..database import get_async_session
-from ..auth import hash_password, verify_password, create_access_token, get_current_user
+from app.models import User, Role, Patient, Doctor
+from ..database import DBSessionRoute, get_async_session
+from ..auth import (
+    password_hasher,
+    build_token_claims,
+    create_access_token,
+    get_current_user,
+)
 from ..schemas import LoginResponse, RegisterRequest, UserResponse
+from ..responses import json_response
 
-router = APIRouter()
+router = APIRouter(route_class=DBSessionRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -21,20 +27,28 @@ async def login(
     """Authenticate user and return access token"""
     try:
         result = await db.execute(
-            select(User).where(User.username == form_data.username)
+            select(User, Patient.id, Doctor.id)
+            .outerjoin(Patient, Patient.user_id == User.id)
+            .outerjoin(Doctor, Doctor.user_id == User.id)
+            .where(User.username == form_data.username)
         )
-        user = result.scalar_one_or_none()
-        if not user or not verify_password(form_data.password, user.password):
+        row = result.first()
+        user, patient_id, doctor_id = row if row else (None, None, None)
+        if not user or not await password_hasher.verify(
+            form_data.password, user.password
+        ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
             )
         access_token_expires = timedelta(minutes=1440)
         access_token = create_access_token(
-            data={"sub": user.username, "role": user.role.value},
+            data=build_token_claims(user, patient_id=patient_id, doctor_id=doctor_id),
             expires_delta=access_token_expires,
         )
-        return LoginResponse(
-            access_token=access_token, user=UserResponse.model_validate(user)
+        return json_response(
+            LoginResponse(
+                access_token=access_token, user=UserResponse.model_validate(user)
+            )
         )
     except HTTPException as e:
         logging.exception(f"HTTP Exception in login: {e}")
@@ -63,7 +77,7 @@ async def register(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
-        hashed_password = hash_password(request.password)
+        hashed_password = await password_hasher.hash(request.password)
         user = User(
             username=request.username, password=hashed_password, role=Role.PATIENT
         )
@@ -75,10 +89,12 @@ async def register(
         db.add(patient)
         await db.commit()
         access_token = create_access_token(
-            data={"sub": user.username, "role": user.role.value}
+            data=build_token_claims(user, patient_id=patient.id)
         )
-        return LoginResponse(
-            access_token=access_token, user=UserResponse.model_validate(user)
+        return json_response(
+            LoginResponse(
+                access_token=access_token, user=UserResponse.model_validate(user)
+            )
         )
     except HTTPException as e:
         logging.exception(f"HTTP Exception in register: {e}")
@@ -95,7 +111,7 @@ async def register(
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information"""
-    return UserResponse.model_validate(current_user)
+    return json_response(UserResponse.model_validate(current_user))
 
 
 @router.post("/logout")
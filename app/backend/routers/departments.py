@@ -1,23 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from datetime import date, datetime
+from typing import Optional
 import logging
-from app.models import Department
-from ..database import get_async_session
+from app.models import Department, Doctor
+from ..database import DBSessionRoute, get_async_session, get_read_session
+from ..cache import DEPARTMENT_CATALOG, DOCTOR_CATALOG, catalog_cache, catalog_response
+from ..responses import json_response
 from ..auth import get_admin_user
-from ..schemas import DepartmentResponse, DepartmentCreate, DepartmentUpdate
+from ..schemas import (
+    DepartmentResponse,
+    DepartmentCreate,
+    DepartmentUpdate,
+    SlotResponse,
+)
+from ..slots import find_free_slots
+from .doctors import resolve_slot_range
 
-router = APIRouter()
+router = APIRouter(route_class=DBSessionRoute)
 logger = logging.getLogger(__name__)
+DEPARTMENT_LIST = TypeAdapter(list[DepartmentResponse])
 
 
 @router.get("/", response_model=list[DepartmentResponse])
-async def get_departments(db: AsyncSession = Depends(get_async_session)):
-    """Get all departments"""
+async def get_departments(
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Get all departments, served pre-serialized from the catalog cache"""
     try:
-        result = await db.execute(select(Department))
-        departments = result.scalars().all()
-        return [DepartmentResponse.model_validate(dep) for dep in departments]
+        entry = catalog_cache.get(DEPARTMENT_CATALOG)
+        if entry is None:
+            version = catalog_cache.version(DEPARTMENT_CATALOG)
+            result = await db.execute(select(Department))
+            departments = DEPARTMENT_LIST.validate_python(
+                result.scalars().all(), from_attributes=True
+            )
+            entry = catalog_cache.set(
+                DEPARTMENT_CATALOG, DEPARTMENT_LIST.dump_json(departments), version
+            )
+        return catalog_response(entry, if_none_match)
     except Exception as e:
         logging.exception(f"Error fetching departments: {e}")
         raise HTTPException(
@@ -39,8 +63,12 @@ async def create_department(
         department = Department.model_validate(department_data)
         db.add(department)
         await db.commit()
+        catalog_cache.invalidate(DEPARTMENT_CATALOG)
         await db.refresh(department)
-        return DepartmentResponse.model_validate(department)
+        return json_response(
+            DepartmentResponse.model_validate(department),
+            status_code=status.HTTP_201_CREATED,
+        )
     except Exception as e:
         logging.exception(f"Error creating department: {e}")
         await db.rollback()
@@ -52,7 +80,7 @@ async def create_department(
 
 @router.get("/{department_id}", response_model=DepartmentResponse)
 async def get_department(
-    department_id: int, db: AsyncSession = Depends(get_async_session)
+    department_id: int, db: AsyncSession = Depends(get_read_session)
 ):
     """Get a specific department by ID"""
     try:
@@ -64,7 +92,7 @@ async def get_department(
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Department not found"
             )
-        return DepartmentResponse.model_validate(department)
+        return json_response(DepartmentResponse.model_validate(department))
     except HTTPException as e:
         logging.exception(f"HTTP exception in get_department: {e}")
         raise
@@ -76,6 +104,43 @@ async def get_department(
         )
 
 
+@router.get("/{department_id}/slots", response_model=list[SlotResponse])
+async def get_department_slots(
+    department_id: int,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """Get open slots of every doctor in a department between two dates"""
+    try:
+        start, end = resolve_slot_range(from_date, to_date)
+        department = await db.get(Department, department_id)
+        if not department:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Department not found"
+            )
+        department_doctors = select(Doctor.id).where(
+            Doctor.department_id == department_id
+        )
+        slots = await find_free_slots(
+            db,
+            lambda column: column.in_(department_doctors),
+            start,
+            end,
+            not_before=datetime.now(),
+        )
+        return json_response(slots)
+    except HTTPException as e:
+        logging.exception(f"HTTP Exception in get_department_slots: {e}")
+        raise
+    except Exception as e:
+        logging.exception(f"Error fetching slots for department {department_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not fetch slots",
+        )
+
+
 @router.put("/{department_id}", response_model=DepartmentResponse)
 async def update_department(
     department_id: int,
@@ -97,8 +162,9 @@ async def update_department(
         for field, value in update_data.items():
             setattr(department, field, value)
         await db.commit()
+        catalog_cache.invalidate(DEPARTMENT_CATALOG, DOCTOR_CATALOG)
         await db.refresh(department)
-        return DepartmentResponse.model_validate(department)
+        return json_response(DepartmentResponse.model_validate(department))
     except Exception as e:
         logging.exception(f"Error updating department {department_id}: {e}")
         await db.rollback()
@@ -126,6 +192,7 @@ async def delete_department(
             )
         await db.delete(department)
         await db.commit()
+        catalog_cache.invalidate(DEPARTMENT_CATALOG, DOCTOR_CATALOG)
     except Exception as e:
         logging.exception(f"Error deleting department {department_id}: {e}")
         await db.rollback()
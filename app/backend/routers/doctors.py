@@ -1,26 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from datetime import date, datetime, timedelta
+from typing import Optional
 import logging
 from app.models import Doctor, Department, User, Role
-from ..database import get_async_session
+from ..database import DBSessionRoute, get_async_session, get_read_session
+from ..cache import DOCTOR_CATALOG, catalog_cache, catalog_response, principal_cache
+from ..responses import json_response
 from ..auth import get_current_user, get_staff_user, get_admin_user
-from ..schemas import DoctorResponse, DoctorCreate, DoctorUpdate
+from ..loaders import RequestLoaders, get_loaders, get_read_loaders
+from ..schemas import DoctorResponse, DoctorCreate, DoctorUpdate, SlotResponse
+from ..slots import MAX_SLOT_SEARCH_DAYS, find_free_slots
 
-router = APIRouter()
+router = APIRouter(route_class=DBSessionRoute)
 logger = logging.getLogger(__name__)
+DOCTOR_LIST = TypeAdapter(list[DoctorResponse])
 
 
 @router.get("/", response_model=list[DoctorResponse])
-async def get_doctors(db: AsyncSession = Depends(get_async_session)):
-    """Get all doctors"""
+async def get_doctors(
+    if_none_match: Optional[str] = Header(None),
+    loaders: RequestLoaders = Depends(get_loaders),
+):
+    """Get all doctors, served pre-serialized from the catalog cache"""
     try:
-        result = await db.execute(
-            select(Doctor).options(selectinload(Doctor.department))
-        )
-        doctors = result.scalars().all()
-        return [DoctorResponse.model_validate(doc) for doc in doctors]
+        entry = catalog_cache.get(DOCTOR_CATALOG)
+        if entry is None:
+            version = catalog_cache.version(DOCTOR_CATALOG)
+            result = await loaders.db.execute(select(Doctor))
+            rows = result.scalars().all()
+            await loaders.attach_departments(rows)
+            doctors = DOCTOR_LIST.validate_python(rows, from_attributes=True)
+            entry = catalog_cache.set(
+                DOCTOR_CATALOG, DOCTOR_LIST.dump_json(doctors), version
+            )
+        return catalog_response(entry, if_none_match)
     except Exception as e:
         logging.exception(f"Error fetching doctors: {e}")
         raise HTTPException(
@@ -33,6 +49,7 @@ async def get_doctors(db: AsyncSession = Depends(get_async_session)):
 async def create_doctor(
     doctor_data: DoctorCreate,
     current_user: User = Depends(get_admin_user),
+    loaders: RequestLoaders = Depends(get_loaders),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Create a new doctor (admin only)"""
@@ -40,8 +57,11 @@ async def create_doctor(
         doctor = Doctor.model_validate(doctor_data)
         db.add(doctor)
         await db.commit()
-        await db.refresh(doctor, ["department"])
-        return DoctorResponse.model_validate(doctor)
+        catalog_cache.invalidate(DOCTOR_CATALOG)
+        await loaders.attach_departments([doctor])
+        return json_response(
+            DoctorResponse.model_validate(doctor), status_code=status.HTTP_201_CREATED
+        )
     except Exception as e:
         logging.exception(f"Error creating doctor: {e}")
         await db.rollback()
@@ -52,20 +72,18 @@ async def create_doctor(
 
 
 @router.get("/{doctor_id}", response_model=DoctorResponse)
-async def get_doctor(doctor_id: int, db: AsyncSession = Depends(get_async_session)):
+async def get_doctor(
+    doctor_id: int, loaders: RequestLoaders = Depends(get_read_loaders)
+):
     """Get a specific doctor by ID"""
     try:
-        result = await db.execute(
-            select(Doctor)
-            .options(selectinload(Doctor.department))
-            .where(Doctor.id == doctor_id)
-        )
-        doctor = result.scalar_one_or_none()
+        doctor = await loaders.doctors.load(doctor_id)
         if not doctor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
             )
-        return DoctorResponse.model_validate(doctor)
+        await loaders.attach_departments([doctor])
+        return json_response(DoctorResponse.model_validate(doctor))
     except Exception as e:
         logging.exception(f"Error fetching doctor {doctor_id}: {e}")
         raise HTTPException(
@@ -74,17 +92,71 @@ async def get_doctor(doctor_id: int, db: AsyncSession = Depends(get_async_sessio
         )
 
 
+def resolve_slot_range(
+    from_date: Optional[date], to_date: Optional[date]
+) -> tuple[date, date]:
+    """Default a slot search to the coming week and bound its length"""
+    start = from_date or date.today()
+    end = to_date or start + timedelta(days=6)
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'",
+        )
+    if (end - start).days >= MAX_SLOT_SEARCH_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Slot searches are limited to {MAX_SLOT_SEARCH_DAYS} days",
+        )
+    return start, end
+
+
+@router.get("/{doctor_id}/slots", response_model=list[SlotResponse])
+async def get_doctor_slots(
+    doctor_id: int,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    loaders: RequestLoaders = Depends(get_read_loaders),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """Get a doctor's open slots between two dates (inclusive)"""
+    try:
+        start, end = resolve_slot_range(from_date, to_date)
+        doctor = await loaders.doctors.load(doctor_id)
+        if not doctor:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
+            )
+        slots = await find_free_slots(
+            db,
+            lambda column: column == doctor_id,
+            start,
+            end,
+            not_before=datetime.now(),
+        )
+        return json_response(slots)
+    except HTTPException as e:
+        logging.exception(f"HTTP Exception in get_doctor_slots: {e}")
+        raise
+    except Exception as e:
+        logging.exception(f"Error fetching slots for doctor {doctor_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not fetch slots",
+        )
+
+
 @router.put("/{doctor_id}", response_model=DoctorResponse)
 async def update_doctor(
     doctor_id: int,
     doctor_update: DoctorUpdate,
     current_user: User = Depends(get_admin_user),
+    loaders: RequestLoaders = Depends(get_loaders),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Update a doctor's information (admin only)"""
     try:
-        result = await db.execute(select(Doctor).where(Doctor.id == doctor_id))
-        doctor = result.scalar_one_or_none()
+        doctor = await loaders.doctors.load(doctor_id)
         if not doctor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
@@ -93,8 +165,10 @@ async def update_doctor(
         for field, value in update_data.items():
             setattr(doctor, field, value)
         await db.commit()
-        await db.refresh(doctor, ["department"])
-        return DoctorResponse.model_validate(doctor)
+        principal_cache.invalidate(user_id=doctor.user_id)
+        catalog_cache.invalidate(DOCTOR_CATALOG)
+        await loaders.attach_departments([doctor])
+        return json_response(DoctorResponse.model_validate(doctor))
     except Exception as e:
         logging.exception(f"Error updating doctor {doctor_id}: {e}")
         await db.rollback()
@@ -108,18 +182,20 @@ async def update_doctor(
 async def delete_doctor(
     doctor_id: int,
     current_user: User = Depends(get_admin_user),
+    loaders: RequestLoaders = Depends(get_loaders),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Delete a doctor (admin only)"""
     try:
-        result = await db.execute(select(Doctor).where(Doctor.id == doctor_id))
-        doctor = result.scalar_one_or_none()
+        doctor = await loaders.doctors.load(doctor_id)
         if not doctor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
             )
         await db.delete(doctor)
         await db.commit()
+        principal_cache.invalidate(user_id=doctor.user_id)
+        catalog_cache.invalidate(DOCTOR_CATALOG)
     except Exception as e:
         logging.exception(f"Error deleting doctor {doctor_id}: {e}")
         await db.rollback()
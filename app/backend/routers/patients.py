@@ -1,26 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select, tuple_
+from typing import Optional
 import logging
-from app.models import Patient, User, Role
-from ..database import get_async_session
+import sys
+from app.models import Patient, User, Role, code_point_order
+from ..database import DBSessionRoute, get_async_session, get_read_session
+from ..cache import principal_cache
+from ..pagination import encode_cursor, decode_cursor
+from ..responses import json_response, model_encoder, stream_json_page
 from ..auth import get_current_user, get_staff_user, get_admin_user
-from ..schemas import PatientResponse, PatientCreate, PatientUpdate
+from ..loaders import RequestLoaders, get_loaders, get_read_loaders
+from ..schemas import PatientResponse, PatientCreate, PatientPage, PatientUpdate
 
-router = APIRouter()
+router = APIRouter(route_class=DBSessionRoute)
 logger = logging.getLogger(__name__)
+MAX_PAGE_SIZE = 200
+encode_patient = model_encoder(PatientResponse)
 
 
-@router.get("/", response_model=list[PatientResponse])
+def _fold_case(text: str, dialect: str) -> str:
+    """Lowercase ``text`` the way the database's lower() does"""
+    if dialect == "sqlite":
+        # SQLite's built-in lower() only folds ASCII letters.
+        return "".join(c.lower() if c.isascii() else c for c in text)
+    return text.lower()
+
+
+def _prefix_match(expression, prefix: str):
+    """Match a prefix as a code point range an index on the expression can serve"""
+    # Every string starting with the prefix sorts below the prefix with its last
+    # code point bumped; trailing maximal code points cannot be bumped.
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    if not stem:
+        return expression >= prefix
+    upper = stem[:-1] + chr(ord(stem[-1]) + 1)
+    return and_(expression >= prefix, expression < upper)
+
+
+def _decode_patient_cursor(cursor: str) -> tuple[str, int]:
+    after_name, after_id = decode_cursor(cursor, 2)
+    if not isinstance(after_name, str):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    try:
+        return after_name, int(after_id)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from e
+
+
+@router.get("/", response_model=PatientPage)
 async def get_patients(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=100),
     current_user: User = Depends(get_staff_user),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    """Get all patients (staff only)"""
+    """Get a page of patients ordered by name (staff only).
+
+    ``q`` is a case-insensitive prefix matched against name, email and phone.
+    """
     try:
-        result = await db.execute(select(Patient))
-        patients = result.scalars().all()
-        return [PatientResponse.model_validate(patient) for patient in patients]
+        sort_name = code_point_order(func.lower(Patient.name))
+        query = select(Patient, sort_name)
+        prefix = _fold_case((q or "").strip(), db.get_bind().dialect.name)
+        if prefix:
+            query = query.where(
+                or_(
+                    _prefix_match(sort_name, prefix),
+                    _prefix_match(code_point_order(func.lower(Patient.email)), prefix),
+                    _prefix_match(code_point_order(Patient.phone), prefix),
+                )
+            )
+        if cursor:
+            after_name, after_id = _decode_patient_cursor(cursor)
+            query = query.where(
+                tuple_(sort_name, Patient.id) > tuple_(after_name, after_id)
+            )
+        query = query.order_by(sort_name, Patient.id).limit(limit + 1)
+        result = await db.execute(query)
+        rows = result.all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_patient, last_name = rows[-1]
+            next_cursor = encode_cursor([last_name, last_patient.id])
+        return stream_json_page(
+            (patient for patient, _ in rows), encode_patient, next_cursor
+        )
+    except HTTPException as e:
+        logging.exception(f"HTTP Exception in get_patients: {e}")
+        raise
     except Exception as e:
         logging.exception(f"Error fetching patients: {e}")
         raise HTTPException(
@@ -33,12 +107,11 @@ async def get_patients(
 async def get_patient(
     patient_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_session),
+    loaders: RequestLoaders = Depends(get_read_loaders),
 ):
     """Get patient by ID"""
     try:
-        result = await db.execute(select(Patient).where(Patient.id == patient_id))
-        patient = result.scalar_one_or_none()
+        patient = await loaders.patients.load(patient_id)
         if not patient:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
@@ -48,7 +121,7 @@ async def get_patient(
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
                 )
-        return PatientResponse.model_validate(patient)
+        return json_response(PatientResponse.model_validate(patient))
     except HTTPException as e:
         logging.exception(f"HTTP Exception in get_patient: {e}")
         raise
@@ -65,12 +138,12 @@ async def update_patient(
     patient_id: int,
     patient_update: PatientUpdate,
     current_user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Update patient information"""
     try:
-        result = await db.execute(select(Patient).where(Patient.id == patient_id))
-        patient = result.scalar_one_or_none()
+        patient = await loaders.patients.load(patient_id)
         if not patient:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
@@ -84,8 +157,9 @@ async def update_patient(
         for field, value in update_data.items():
             setattr(patient, field, value)
         await db.commit()
+        principal_cache.invalidate(user_id=patient.user_id)
         await db.refresh(patient)
-        return PatientResponse.model_validate(patient)
+        return json_response(PatientResponse.model_validate(patient))
     except HTTPException as e:
         logging.exception(f"HTTP Exception in update_patient: {e}")
         raise
@@ -102,18 +176,19 @@ async def update_patient(
 async def delete_patient(
     patient_id: int,
     current_user: User = Depends(get_admin_user),
+    loaders: RequestLoaders = Depends(get_loaders),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Delete patient (admin only)"""
     try:
-        result = await db.execute(select(Patient).where(Patient.id == patient_id))
-        patient = result.scalar_one_or_none()
+        patient = await loaders.patients.load(patient_id)
         if not patient:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
             )
         await db.delete(patient)
         await db.commit()
+        principal_cache.invalidate(user_id=patient.user_id)
         return {"message": "Patient deleted successfully"}
     except HTTPException as e:
         logging.exception(f"HTTP Exception in delete_patient: {e}")
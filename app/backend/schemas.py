@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import datetime, date, time
 from app.models import Role, AppointmentStatus
@@ -22,6 +22,16 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class Principal(BaseModel):
+    """Authenticated caller, including the role-profile IDs carried by the token"""
+
+    id: int
+    username: str
+    role: Role
+    patient_id: Optional[int] = None
+    doctor_id: Optional[int] = None
+
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -66,6 +76,11 @@ class PatientResponse(PatientBase):
         from_attributes = True
 
 
+class PatientPage(BaseModel):
+    items: list[PatientResponse]
+    next_cursor: Optional[str] = None
+
+
 class DepartmentBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -132,6 +147,14 @@ class AppointmentUpdate(BaseModel):
     end_time: Optional[time] = None
     status: Optional[AppointmentStatus] = None
 
+    @field_validator("date", "start_time", "end_time", "status")
+    @classmethod
+    def not_null(cls, value):
+        """Fields may be omitted, but an explicit null cannot be stored"""
+        if value is None:
+            raise ValueError("must not be null")
+        return value
+
 
 class AppointmentResponse(AppointmentBase):
     id: int
@@ -144,6 +167,34 @@ class AppointmentResponse(AppointmentBase):
         from_attributes = True
 
 
+class AppointmentPage(BaseModel):
+    items: list[AppointmentResponse]
+    next_cursor: Optional[str] = None
+
+
+class AppointmentBatchCreate(BaseModel):
+    items: list[AppointmentCreate] = Field(min_length=1, max_length=500)
+
+
+class AppointmentBatchUpdateItem(AppointmentUpdate):
+    id: int
+
+
+class AppointmentBatchUpdate(BaseModel):
+    items: list[AppointmentBatchUpdateItem] = Field(min_length=1, max_length=500)
+
+
+class AppointmentBatchResult(BaseModel):
+    index: int
+    status: int
+    appointment: Optional[AppointmentResponse] = None
+    detail: Optional[str] = None
+
+
+class AppointmentBatchResponse(BaseModel):
+    results: list[AppointmentBatchResult]
+
+
 class AvailabilityBase(BaseModel):
     weekday: int
     start_time: time
@@ -170,6 +221,13 @@ class AvailabilityResponse(AvailabilityBase):
         from_attributes = True
 
 
+class SlotResponse(BaseModel):
+    doctor_id: int
+    date: date
+    start_time: time
+    end_time: time
+
+
 class DashboardStats(BaseModel):
     total_patients: int
     total_doctors: int
@@ -0,0 +1,161 @@
+"""Free-slot search over doctor availability templates and booked appointments.
+
+Slots are handled as int64 minute offsets so expansion and subtraction run as
+numpy array operations across all doctors and days at once, instead of
+per-slot Python loops.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Iterable, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Appointment, AppointmentStatus, Availability
+
+MINUTES_PER_DAY = 24 * 60
+EPOCH = date(1970, 1, 1)
+MAX_SLOT_SEARCH_DAYS = 62
+_TIMES = [time(minute // 60, minute % 60) for minute in range(MINUTES_PER_DAY)]
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _epoch_day(value: date) -> int:
+    return (value - EPOCH).days
+
+
+def expand_availability(
+    availabilities: Iterable[Availability], start: date, end: date
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Expand weekly availability rows into (doctor_id, start, end) minute arrays"""
+    days = np.arange(_epoch_day(start), _epoch_day(end) + 1, dtype=np.int64)
+    # 1970-01-01 was a Thursday; Monday is weekday 0 as in date.weekday().
+    weekdays = (days + 3) % 7
+    doctor_parts, start_parts, end_parts = [], [], []
+    for availability in availabilities:
+        duration = int(availability.slot_duration)
+        first = _minutes(availability.start_time)
+        last = _minutes(availability.end_time) - duration
+        if duration <= 0 or last < first:
+            continue
+        matching_days = days[weekdays == availability.weekday]
+        if matching_days.size == 0:
+            continue
+        offsets = np.arange(first, last + 1, duration, dtype=np.int64)
+        starts = (matching_days[:, None] * MINUTES_PER_DAY + offsets[None, :]).ravel()
+        doctor_parts.append(np.full(starts.size, availability.doctor_id, np.int64))
+        start_parts.append(starts)
+        end_parts.append(starts + duration)
+    if not start_parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    return (
+        np.concatenate(doctor_parts),
+        np.concatenate(start_parts),
+        np.concatenate(end_parts),
+    )
+
+
+def subtract_booked(
+    doctors: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    booked_doctors: np.ndarray,
+    booked_starts: np.ndarray,
+    booked_ends: np.ndarray,
+) -> np.ndarray:
+    """Return a mask of candidate slots that overlap no booked interval.
+
+    Each doctor is shifted onto its own segment of a shared time axis so a
+    single sorted search handles every doctor: with bookings sorted by start,
+    a slot is taken iff the furthest end among bookings starting before the
+    slot ends lies after the slot start.
+    """
+    if booked_starts.size == 0 or starts.size == 0:
+        return np.ones(starts.size, dtype=bool)
+    span = int(max(ends.max(), booked_ends.max())) + 1
+    origin = int(min(starts.min(), booked_starts.min()))
+    doctor_ids = np.unique(np.concatenate([doctors, booked_doctors]))
+    slot_base = np.searchsorted(doctor_ids, doctors) * (span - origin)
+    booked_base = np.searchsorted(doctor_ids, booked_doctors) * (span - origin)
+    keyed_starts = booked_base + booked_starts - origin
+    order = np.argsort(keyed_starts, kind="stable")
+    keyed_starts = keyed_starts[order]
+    furthest_end = np.maximum.accumulate((booked_base + booked_ends - origin)[order])
+    candidate_starts = slot_base + starts - origin
+    candidate_ends = slot_base + ends - origin
+    preceding = np.searchsorted(keyed_starts, candidate_ends, side="left")
+    taken = (preceding > 0) & (
+        furthest_end[np.maximum(preceding - 1, 0)] > candidate_starts
+    )
+    return ~taken
+
+
+async def find_free_slots(
+    db: AsyncSession,
+    doctor_filter: Callable,
+    start: date,
+    end: date,
+    not_before: Optional[datetime] = None,
+) -> list[dict]:
+    """Compute open slots between two dates for the doctors matched by a filter.
+
+    ``doctor_filter`` maps a ``doctor_id`` column to a SQL condition and is
+    applied to both the availability and the appointment query.
+    """
+    availability_result = await db.execute(
+        select(Availability).where(doctor_filter(Availability.doctor_id))
+    )
+    availabilities = availability_result.scalars().all()
+    doctors, starts, ends = expand_availability(availabilities, start, end)
+    if starts.size == 0:
+        return []
+    booked_result = await db.execute(
+        select(
+            Appointment.doctor_id,
+            Appointment.date,
+            Appointment.start_time,
+            Appointment.end_time,
+        ).where(
+            doctor_filter(Appointment.doctor_id),
+            Appointment.status == AppointmentStatus.BOOKED,
+            Appointment.date >= start,
+            Appointment.date <= end,
+        )
+    )
+    booked = booked_result.all()
+    booked_doctors = np.fromiter((row[0] for row in booked), np.int64, len(booked))
+    booked_days = np.fromiter(
+        (_epoch_day(row[1]) for row in booked), np.int64, len(booked)
+    )
+    booked_starts = booked_days * MINUTES_PER_DAY + np.fromiter(
+        (_minutes(row[2]) for row in booked), np.int64, len(booked)
+    )
+    booked_ends = booked_days * MINUTES_PER_DAY + np.fromiter(
+        (_minutes(row[3]) for row in booked), np.int64, len(booked)
+    )
+    free = subtract_booked(
+        doctors, starts, ends, booked_doctors, booked_starts, booked_ends
+    )
+    if not_before is not None:
+        cutoff = _epoch_day(not_before.date()) * MINUTES_PER_DAY + _minutes(
+            not_before.time()
+        )
+        free &= starts >= cutoff
+    doctors, starts, ends = doctors[free], starts[free], ends[free]
+    order = np.lexsort((doctors, starts))
+    doctors, starts, ends = doctors[order], starts[order], ends[order]
+    slot_days = (starts // MINUTES_PER_DAY).tolist()
+    return [
+        {
+            "doctor_id": doctor_id,
+            "date": EPOCH + timedelta(days=day),
+            "start_time": _TIMES[slot_start % MINUTES_PER_DAY],
+            "end_time": _TIMES[slot_end % MINUTES_PER_DAY],
+        }
+        for doctor_id, day, slot_start, slot_end in zip(
+            doctors.tolist(), slot_days, starts.tolist(), ends.tolist()
+        )
+    ]
\ No newline at end of file
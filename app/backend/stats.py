@@ -0,0 +1,142 @@
+"""Dashboard statistics served from a short-TTL snapshot kept current by writes.
+
+The snapshot is loaded with a single aggregate query. Between reloads, ORM
+session events apply the creates, deletes and status changes committed by
+this worker, so admin dashboard refreshes do not scan the appointment table.
+With the SQLite write queue, they wait for the group commit of those writes.
+The TTL bounds how long writes made by other workers can go unnoticed.
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+from typing import Optional
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models import Appointment, AppointmentStatus, Doctor, Patient
+from .writer import after_durable_commit
+
+DASHBOARD_STATS_TTL_SECONDS = int(os.getenv("DASHBOARD_STATS_TTL_SECONDS", "30"))
+STATUS_COUNTERS = {
+    AppointmentStatus.BOOKED: "pending_appointments",
+    AppointmentStatus.COMPLETED: "completed_appointments",
+    AppointmentStatus.CANCELLED: "cancelled_appointments",
+}
+_PENDING_DELTAS_KEY = "dashboard_stats_deltas"
+
+
+async def load_dashboard_stats(db: AsyncSession) -> dict:
+    """Count patients, doctors and appointments by status in one round trip"""
+
+    def count_status(value: AppointmentStatus):
+        return func.count(case((Appointment.status == value, 1)))
+
+    appointment_counts = select(
+        func.count(Appointment.id).label("total_appointments"),
+        *(
+            count_status(value).label(counter)
+            for value, counter in STATUS_COUNTERS.items()
+        ),
+    ).subquery()
+    result = await db.execute(
+        select(
+            select(func.count(Patient.id)).scalar_subquery().label("total_patients"),
+            select(func.count(Doctor.id)).scalar_subquery().label("total_doctors"),
+            *appointment_counts.c,
+        )
+    )
+    return dict(result.one()._mapping)
+
+
+class DashboardStatsCache:
+    """Last loaded dashboard counts, adjusted in place by committed writes.
+
+    Every applied delta bumps a generation number. A snapshot is only stored
+    if no delta arrived while it was loaded, since it may or may not include
+    that write.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._stats: Optional[dict] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[dict]:
+        with self._lock:
+            if self._stats is None or time.monotonic() - self._loaded_at > self.ttl:
+                return None
+            return dict(self._stats)
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, stats: dict, generation: int) -> None:
+        """Cache counts loaded after ``generation`` was read, unless now stale"""
+        with self._lock:
+            if self._generation != generation:
+                return
+            self._stats = dict(stats)
+            self._loaded_at = time.monotonic()
+
+    def apply(self, deltas: Counter) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._stats is None:
+                return
+            for counter, delta in deltas.items():
+                self._stats[counter] = self._stats.get(counter, 0) + delta
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._stats = None
+
+
+dashboard_stats_cache = DashboardStatsCache(ttl=DASHBOARD_STATS_TTL_SECONDS)
+
+
+def _count_row(obj, sign: int, deltas: Counter) -> None:
+    if isinstance(obj, Patient):
+        deltas["total_patients"] += sign
+    elif isinstance(obj, Doctor):
+        deltas["total_doctors"] += sign
+    elif isinstance(obj, Appointment):
+        deltas["total_appointments"] += sign
+        if obj.status is not None:
+            deltas[STATUS_COUNTERS[AppointmentStatus(obj.status)]] += sign
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_deltas(session: Session, flush_context) -> None:
+    deltas = session.info.setdefault(_PENDING_DELTAS_KEY, Counter())
+    for obj in session.new:
+        _count_row(obj, 1, deltas)
+    for obj in session.deleted:
+        _count_row(obj, -1, deltas)
+    for obj in session.dirty:
+        if not isinstance(obj, Appointment):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not (history.added and history.deleted):
+            continue
+        for value in history.deleted:
+            deltas[STATUS_COUNTERS[AppointmentStatus(value)]] -= 1
+        for value in history.added:
+            deltas[STATUS_COUNTERS[AppointmentStatus(value)]] += 1
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_deltas(session: Session) -> None:
+    deltas = session.info.pop(_PENDING_DELTAS_KEY, None)
+    if deltas:
+        after_durable_commit(session, lambda: dashboard_stats_cache.apply(deltas))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_deltas(session: Session) -> None:
+    session.info.pop(_PENDING_DELTAS_KEY, None)
@@ -0,0 +1,153 @@
+"""Stress-test double-booking protection with concurrent bookings of one slot.
+
+Usage: python -m app.backend.stress_bookings [--requests N] [--postgres-url URL]
+
+Fires N concurrent ``POST /api/appointments`` for the same doctor and time
+through the app in-process, then checks that exactly one booking succeeded,
+the other N-1 got a 409 and a single appointment row exists. It always runs
+against a fresh SQLite file (overlap triggers) and, with ``--postgres-url``,
+also against that PostgreSQL database (exclusion constraint). The PostgreSQL
+run only adds its own user, doctor and patient; migrations are applied first.
+Each target runs in a fresh process, because the engine is configured from
+the environment at import time.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+
+async def run_stress(requests: int) -> dict:
+    import httpx
+    from sqlalchemy import func, select
+    from app.backend.main import app
+    from app.backend.auth import create_access_token, hash_password
+    from app.backend.database import AsyncSessionLocal, database_pool_stats
+    from app.models import Appointment, Doctor, Patient, Role, User
+
+    async with app.router.lifespan_context(app):
+        username = f"stress-{uuid.uuid4().hex[:12]}"
+        async with AsyncSessionLocal() as session:
+            admin = User(
+                username=username, password=hash_password("x"), role=Role.ADMIN
+            )
+            session.add(admin)
+            await session.flush()
+            doctor = Doctor(name="Doctor", specialization="General", user_id=admin.id)
+            patient = Patient(
+                name="Patient", email=f"{username}@example.com", user_id=admin.id
+            )
+            session.add_all([doctor, patient])
+            await session.commit()
+            doctor_id = doctor.id
+            patient_id = patient.id
+        token = create_access_token({"sub": username, "role": Role.ADMIN.value})
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://stress",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=None,
+        ) as client:
+            booking = {
+                "date": "2030-01-01",
+                "start_time": "09:00",
+                "end_time": "09:30",
+                "doctor_id": doctor_id,
+                "patient_id": patient_id,
+            }
+            responses = await asyncio.gather(
+                *(
+                    client.post(
+                        "/api/appointments/", params={"expand": ""}, json=booking
+                    )
+                    for _ in range(requests)
+                )
+            )
+        async with AsyncSessionLocal() as session:
+            rows = await session.scalar(
+                select(func.count())
+                .select_from(Appointment)
+                .where(Appointment.doctor_id == doctor_id)
+            )
+    statuses: dict = {}
+    for response in responses:
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    return {
+        "statuses": statuses,
+        "appointment_rows": rows,
+        "database_locked_errors": database_pool_stats()["database_locked_errors"],
+    }
+
+
+def check(result: dict, requests: int) -> list[str]:
+    """Return what the run got wrong, if anything"""
+    statuses = {int(code): count for code, count in result["statuses"].items()}
+    problems = []
+    if statuses.get(200, 0) != 1:
+        problems.append(f"expected exactly one 200, got {statuses.get(200, 0)}")
+    if statuses.get(409, 0) != requests - 1:
+        problems.append(
+            f"expected {requests - 1} 409s, got {statuses.get(409, 0)}"
+        )
+    if result["appointment_rows"] != 1:
+        problems.append(
+            f"expected one appointment row, got {result['appointment_rows']}"
+        )
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--postgres-url", help="scratch PostgreSQL database URL")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        result = asyncio.run(run_stress(args.requests))
+        print(json.dumps(result))
+        return
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        targets = {
+            "sqlite triggers": {
+                "DATABASE_URL": f"sqlite+aiosqlite:///{directory}/stress.db",
+                "DB_SCHEMA_MODE": "create_all",
+            }
+        }
+        if args.postgres_url:
+            targets["postgresql exclusion constraint"] = {
+                "DATABASE_URL": args.postgres_url,
+                "DB_SCHEMA_MODE": "migrate",
+            }
+        for name, overrides in targets.items():
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "app.backend.stress_bookings",
+                    "--child",
+                    f"--requests={args.requests}",
+                ],
+                env={**os.environ, **overrides},
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            problems = check(result, args.requests)
+            failed = failed or bool(problems)
+            print(f"{name}: {'FAIL' if problems else 'ok'} {json.dumps(result)}")
+            for problem in problems:
+                print(f"  {problem}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Single-writer queue with group commit for SQLite deployments.
+
+SQLite allows one writer at a time, so concurrent commits from a pool of
+connections end up waiting on each other's file lock and failing with
+``database is locked`` once the busy timeout runs out. With the coordinator
+enabled, sessions keep reading through the pool, but from their first write
+they take turns on one dedicated writer connection. Each session's writes go
+into a SAVEPOINT of a shared transaction, and the transaction is committed
+once for every group of sessions that finished writing, so a burst of
+bookings pays for one commit instead of one per request.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.util import await_only
+
+_GROUP_COMMIT_CALLBACKS_KEY = "after_group_commit"
+
+
+def _disable_implicit_begin(dbapi_connection, connection_record) -> None:
+    # The sqlite3 driver's own BEGIN handling breaks SAVEPOINTs; emit it ourselves.
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(connection) -> None:
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def after_durable_commit(session: Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's committed writes are on disk.
+
+    Call from an ``after_commit`` listener. For a session on the writer that
+    commit only released its SAVEPOINT, so the callback waits for the group
+    commit and is dropped if that fails; otherwise it runs right away.
+    """
+    if getattr(session, "writer_connection", None) is None:
+        callback()
+        return
+    session.info.setdefault(_GROUP_COMMIT_CALLBACKS_KEY, []).append(callback)
+
+
+class SQLiteWriteCoordinator:
+    """Lends the writer connection to one session at a time and group-commits"""
+
+    def __init__(
+        self, url: str, group_commit_window_ms: float, on_connect: Callable
+    ):
+        self.engine = create_async_engine(url, poolclass=NullPool)
+        event.listen(self.engine.sync_engine, "connect", on_connect)
+        event.listen(self.engine.sync_engine, "connect", _disable_implicit_begin)
+        event.listen(self.engine.sync_engine, "begin", _begin_immediate)
+        self.group_commit_window = group_commit_window_ms / 1000
+        self._connection: Optional[AsyncConnection] = None
+        self._writer_lock: Optional[asyncio.Lock] = None
+        self._pending: list[asyncio.Future] = []
+        self._commit_task: Optional[asyncio.Task] = None
+        self._stats_lock = threading.Lock()
+        self._writes = 0
+        self._groups = 0
+        self._largest_group = 0
+        self._failed_groups = 0
+        self._acquisitions = 0
+        self._total_wait_seconds = 0.0
+
+    async def start(self) -> None:
+        if self._connection is None:
+            self._writer_lock = asyncio.Lock()
+            self._connection = await self.engine.connect()
+
+    async def stop(self) -> None:
+        if self._commit_task is not None:
+            await self._commit_task
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+        await self.engine.dispose()
+
+    async def acquire(self):
+        """Wait for the writer connection and return it for a session to bind"""
+        await self.start()
+        started = time.perf_counter()
+        await self._writer_lock.acquire()
+        with self._stats_lock:
+            self._acquisitions += 1
+            self._total_wait_seconds += time.perf_counter() - started
+        if not self._connection.in_transaction():
+            await self._connection.begin()
+        return self._connection.sync_connection
+
+    async def release(self, committed: bool) -> None:
+        """Hand the writer on; committed writes wait for their group commit"""
+        if not committed:
+            self._writer_lock.release()
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        self._writer_lock.release()
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._commit_group())
+        await future
+
+    async def _commit_group(self) -> None:
+        if self.group_commit_window:
+            await asyncio.sleep(self.group_commit_window)
+        # Writers already queued for the lock get their turn first, so they
+        # join this group instead of waiting for the next one.
+        async with self._writer_lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                await self._connection.commit()
+            except Exception as e:
+                await self._connection.rollback()
+                with self._stats_lock:
+                    self._failed_groups += 1
+                for future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            with self._stats_lock:
+                self._writes += len(pending)
+                self._groups += 1
+                self._largest_group = max(self._largest_group, len(pending))
+            for future in pending:
+                if not future.done():
+                    future.set_result(None)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            acquisitions = self._acquisitions
+            return {
+                "committed_writes": self._writes,
+                "group_commits": self._groups,
+                "avg_group_size": self._writes / self._groups if self._groups else 0.0,
+                "largest_group": self._largest_group,
+                "failed_group_commits": self._failed_groups,
+                "queued_commits": len(self._pending),
+                "avg_writer_wait_ms": (
+                    self._total_wait_seconds / acquisitions * 1000
+                    if acquisitions
+                    else 0.0
+                ),
+            }
+
+
+class CoordinatedSession(Session):
+    """Session that binds to the coordinator's writer from its first write on"""
+
+    def __init__(self, *args, write_coordinator: SQLiteWriteCoordinator, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_coordinator = write_coordinator
+        self.writer_connection = None
+
+    def _acquire_writer(self) -> None:
+        if self.writer_connection is None:
+            self.writer_connection = await_only(self.write_coordinator.acquire())
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if isinstance(clause, UpdateBase):
+            self._acquire_writer()
+        if self.writer_connection is not None:
+            return self.writer_connection
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def flush(self, objects=None) -> None:
+        if not self._is_clean():
+            self._acquire_writer()
+        super().flush(objects)
+
+
+class CoordinatedAsyncSession(AsyncSession):
+    """Releases the writer once the session's SAVEPOINT is released or rolled back.
+
+    Requires ``join_transaction_mode="create_savepoint"`` so that committing
+    the session only releases its SAVEPOINT on the shared writer transaction.
+    """
+
+    async def _release_writer(self, committed: bool) -> None:
+        session = self.sync_session
+        if session.writer_connection is not None:
+            session.writer_connection = None
+            callbacks = session.info.pop(_GROUP_COMMIT_CALLBACKS_KEY, [])
+            await session.write_coordinator.release(committed)
+            if committed:
+                for callback in callbacks:
+                    callback()
+
+    async def commit(self) -> None:
+        await super().commit()
+        await self._release_writer(committed=True)
+
+    async def rollback(self) -> None:
+        await super().rollback()
+        await self._release_writer(committed=False)
+
+    async def close(self) -> None:
+        await super().close()
+        await self._release_writer(committed=False)
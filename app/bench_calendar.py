@@ -0,0 +1,103 @@
+"""Benchmark CalendarState slot generation and lookups across providers x months.
+
+Usage: python -m app.bench_calendar [--providers 1,5,10,30] [--months 1,3,6]
+       [--lookups N]
+
+Drives a real ``CalendarState`` (in a fresh session per grid cell) through
+``generate_monthly_slots`` with a weekday 08:00-18:00 template in 15 minute
+slots for every provider and month of the grid. It then times
+``_slot_exists`` lookups and a rebuild of ``calendar_grid``. Time per
+generated slot stays flat as the grid grows if generation scales linearly.
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+import reflex as rx
+from reflex import constants
+from reflex.istate.data import RouterData
+from app.states.calendar_state import CalendarState
+
+TEMPLATE = {
+    "weekdays": [0, 1, 2, 3, 4],
+    "start_time": "08:00",
+    "end_time": "18:00",
+    "slot_duration": 15,
+}
+
+
+def new_session() -> CalendarState:
+    """A CalendarState bound to its own client token, as a fresh browser gets"""
+    root = rx.State(_reflex_internal_init=True)
+    root.router = RouterData.from_router_data(
+        {constants.RouteVar.CLIENT_TOKEN: f"bench-{uuid.uuid4().hex}"}
+    )
+    return root.get_substate(CalendarState.get_full_name().split("."))
+
+
+def month_starts(months: int) -> list[datetime]:
+    first = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    starts = []
+    for _ in range(months):
+        starts.append(first)
+        first = (first + timedelta(days=31)).replace(day=1)
+    return starts
+
+
+def run(providers: int, months: int, lookups: int) -> dict:
+    state = new_session()
+    started = time.perf_counter()
+    for provider_id in range(1, providers + 1):
+        for month_start in month_starts(months):
+            for _ in CalendarState.generate_monthly_slots.fn(
+                state, provider_id, month_start, TEMPLATE
+            ):
+                pass
+    generated = time.perf_counter() - started
+    store = state._get_slot_store()
+    rng = random.Random(0)
+    starts = [datetime.fromisoformat(slot["start_datetime"]) for slot in store]
+    probes = [
+        (rng.randint(1, providers), rng.choice(starts)) for _ in range(lookups)
+    ]
+    started = time.perf_counter()
+    for provider_id, start in probes:
+        state._slot_exists(provider_id, start)
+    looked_up = time.perf_counter() - started
+    state.selected_provider_id = providers
+    started = time.perf_counter()
+    state.calendar_grid
+    grid = time.perf_counter() - started
+    return {
+        "slots": len(store),
+        "generate_s": generated,
+        "us_per_slot": generated / len(store) * 1e6,
+        "us_per_lookup": looked_up / lookups * 1e6,
+        "grid_ms": grid * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--providers", default="1,5,10,30")
+    parser.add_argument("--months", default="1,3,6")
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    print(
+        f"{'providers':>9} {'months':>6} {'slots':>8} {'generate s':>10} "
+        f"{'us/slot':>8} {'us/lookup':>9} {'grid ms':>8}"
+    )
+    for providers in map(int, args.providers.split(",")):
+        for months in map(int, args.months.split(",")):
+            result = run(providers, months, args.lookups)
+            print(
+                f"{providers:>9} {months:>6} {result['slots']:>8} "
+                f"{result['generate_s']:>10.3f} {result['us_per_slot']:>8.1f} "
+                f"{result['us_per_lookup']:>9.2f} {result['grid_ms']:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,6 @@ def admin_sidebar() -> rx.Component:
                     class_name="grid items-start px-2 text-sm font-medium",
                 ),
                 class_name="flex-1 py-4",
-                on_mount=AdminState.get_patients,
             ),
             rx.el.div(
                 rx.el.button(
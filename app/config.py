@@ -7,4 +7,16 @@ class Config(rx.Config):
 
 
 config = Config(app_name="app", plugins=[rx.plugins.TailwindV3Plugin()])
-BACKEND_API_URL = os.getenv("BACKEND_API_URL", "http://localhost:8000")
\ No newline at end of file
+BACKEND_API_URL = os.getenv("BACKEND_API_URL", "http://localhost:8000")
+BACKEND_TRANSPORT = os.getenv("BACKEND_TRANSPORT", "http")
+BACKEND_HTTP_MAX_CONNECTIONS = int(os.getenv("BACKEND_HTTP_MAX_CONNECTIONS", "100"))
+BACKEND_HTTP_MAX_KEEPALIVE = int(os.getenv("BACKEND_HTTP_MAX_KEEPALIVE", "20"))
+BACKEND_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("BACKEND_HTTP_KEEPALIVE_EXPIRY", "30"))
+BACKEND_HTTP_TIMEOUT = float(os.getenv("BACKEND_HTTP_TIMEOUT", "10"))
+BACKEND_HTTP_CONNECT_TIMEOUT = float(os.getenv("BACKEND_HTTP_CONNECT_TIMEOUT", "5"))
+SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+JWT_ALGORITHM = "HS256"
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+AUTH_REVALIDATE_BEFORE_EXPIRY_SECONDS = int(
+    os.getenv("AUTH_REVALIDATE_BEFORE_EXPIRY_SECONDS", "600")
+)
\ No newline at end of file
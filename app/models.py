@@ -1,4 +1,7 @@
 import reflex as rx
+from sqlalchemy import DDL, Index, String, event, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from sqlmodel import Field, Relationship, SQLModel
 from typing import Optional
 import datetime
@@ -39,9 +42,11 @@ class Doctor(SQLModel, table=True):
     specialization: str
     contact_info: Optional[str] = None
     google_calendar_id: Optional[str] = None
-    department_id: Optional[int] = Field(default=None, foreign_key="department.id")
+    department_id: Optional[int] = Field(
+        default=None, foreign_key="department.id", index=True
+    )
     department: Optional["Department"] = Relationship(back_populates="doctors")
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     user: "User" = Relationship(back_populates="doctor")
     appointments: list["Appointment"] = Relationship(back_populates="doctor")
     availabilities: list["Availability"] = Relationship(back_populates="doctor")
@@ -53,12 +58,56 @@ class Patient(SQLModel, table=True):
     phone: Optional[str] = None
     email: str = Field(unique=True, index=True)
     created_at: datetime.datetime = Field(default_factory=datetime.datetime.utcnow)
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     user: "User" = Relationship(back_populates="patient")
     appointments: list["Appointment"] = Relationship(back_populates="patient")
 
 
+class code_point_order(FunctionElement):
+    """Compare a text expression by code point, whatever the database locale.
+
+    Prefix searches are run as ranges, which are only exact under code point
+    order: PostgreSQL gets ``COLLATE "C"``, SQLite already compares that way.
+    """
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(code_point_order)
+def _compile_code_point_order(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(code_point_order, "postgresql")
+def _compile_code_point_order_postgresql(element, compiler, **kw):
+    return f'{compiler.process(element.clauses, **kw)} COLLATE "C"'
+
+
+Index(
+    "ix_patient_lower_name_id", code_point_order(func.lower(Patient.name)), Patient.id
+)
+Index("ix_patient_lower_email", code_point_order(func.lower(Patient.email)))
+Index("ix_patient_phone", code_point_order(Patient.phone))
+
+
 class Appointment(SQLModel, table=True):
+    __table_args__ = (
+        Index(
+            "ix_appointment_doctor_id_date_start_time",
+            "doctor_id",
+            "date",
+            "start_time",
+        ),
+        Index(
+            "ix_appointment_patient_id_date_start_time",
+            "patient_id",
+            "date",
+            "start_time",
+        ),
+        Index("ix_appointment_date_start_time_id", "date", "start_time", "id"),
+        Index("ix_appointment_status_date", "status", "date"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     date: datetime.date
     start_time: datetime.time
@@ -71,7 +120,62 @@ class Appointment(SQLModel, table=True):
     patient: "Patient" = Relationship(back_populates="appointments")
 
 
+APPOINTMENT_OVERLAP_CONSTRAINT = "appointment_overlap"
+_SQLITE_OVERLAP_CHECK = """
+    SELECT RAISE(ABORT, 'appointment_overlap')
+    WHERE NEW.status = 'BOOKED' AND EXISTS (
+        SELECT 1 FROM appointment
+        WHERE doctor_id = NEW.doctor_id
+          AND date = NEW.date
+          AND status = 'BOOKED'
+          AND start_time < NEW.end_time
+          AND end_time > NEW.start_time
+          {exclude_self}
+    );
+"""
+APPOINTMENT_OVERLAP_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS btree_gist",
+        "ALTER TABLE appointment ADD CONSTRAINT appointment_overlap "
+        "EXCLUDE USING gist (doctor_id WITH =, "
+        'tsrange("date" + start_time, "date" + end_time) WITH &&) '
+        "WHERE (status = 'BOOKED')",
+    ],
+    "sqlite": [
+        "CREATE TRIGGER IF NOT EXISTS appointment_overlap_insert "
+        "BEFORE INSERT ON appointment "
+        "BEGIN" + _SQLITE_OVERLAP_CHECK.format(exclude_self="") + "END",
+        "CREATE TRIGGER IF NOT EXISTS appointment_overlap_update "
+        "BEFORE UPDATE OF date, start_time, end_time, status, doctor_id "
+        "ON appointment "
+        "BEGIN" + _SQLITE_OVERLAP_CHECK.format(exclude_self="AND id != NEW.id") + "END",
+    ],
+}
+# Per dialect: a query counting the guard's objects, and how many there must be.
+APPOINTMENT_OVERLAP_GUARD_CHECKS = {
+    "postgresql": (
+        "SELECT count(*) FROM pg_constraint WHERE conname = 'appointment_overlap'",
+        1,
+    ),
+    "sqlite": (
+        "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN "
+        "('appointment_overlap_insert', 'appointment_overlap_update')",
+        2,
+    ),
+}
+for _dialect, _statements in APPOINTMENT_OVERLAP_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Appointment.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
+
+
 class Availability(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_availability_doctor_id_weekday", "doctor_id", "weekday"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     weekday: int
     start_time: datetime.time
@@ -2,9 +2,11 @@ import reflex as rx
 from typing import TypedDict
 import logging
 import httpx
-from app.api_client import APIClient, Patient
+from app.api_client import APIClient, Patient, PatientPage
 from app.auth import AuthState
 
+PATIENT_PAGE_SIZE = 50
+
 
 class SidebarItem(TypedDict):
     name: str
@@ -26,19 +28,94 @@ class AdminState(rx.State):
         {"name": "Patients", "icon": "user", "route": "/admin/patients"},
     ]
     patients: list[Patient] = []
+    patient_search: str = ""
+    patient_cursors: list[str] = []
+    next_patient_cursor: str = ""
     is_loading: bool = False
     is_saving: bool = False
     is_deleting: bool = False
+    _prefetched_patients: dict = {}
+
+    async def _fetch_patient_page(self, cursor: str) -> PatientPage:
+        auth_state = await self.get_state(AuthState)
+        api_client = APIClient(token=auth_state.token)
+        return await api_client.get_patients(
+            limit=PATIENT_PAGE_SIZE, cursor=cursor or None, search=self.patient_search
+        )
+
+    async def _show_patient_page(self, cursors: list[str]):
+        """Show the page after the last of ``cursors`` and prefetch the next one.
+
+        The cursor stack is only replaced once the page is loaded, so a failed
+        fetch leaves it matching the page on screen.
+        """
+        cursor = cursors[-1] if cursors else ""
+        prefetched = self._prefetched_patients
+        if prefetched.get("key") == (self.patient_search, cursor):
+            page = prefetched["page"]
+        else:
+            self.is_loading = True
+            try:
+                page = await self._fetch_patient_page(cursor)
+            except (httpx.HTTPError, ValueError) as e:
+                logging.exception(f"Failed to fetch patients: {e}")
+                return rx.toast.error("Could not load patients.")
+            finally:
+                self.is_loading = False
+        self.patient_cursors = cursors
+        self.patients = page["items"]
+        self.next_patient_cursor = page["next_cursor"] or ""
+        self._prefetched_patients = {}
+        if self.next_patient_cursor:
+            return AdminState.prefetch_next_patients
 
     @rx.event
     async def get_patients(self):
-        self.is_loading = True
+        return await self._show_patient_page([])
+
+    @rx.event
+    async def search_patients(self, search: str):
+        self.patient_search = search.strip()
+        return await self.get_patients()
+
+    @rx.event
+    async def next_patients_page(self):
+        if not self.next_patient_cursor:
+            return
+        return await self._show_patient_page(
+            [*self.patient_cursors, self.next_patient_cursor]
+        )
+
+    @rx.event
+    async def previous_patients_page(self):
+        if not self.patient_cursors:
+            return
+        return await self._show_patient_page(self.patient_cursors[:-1])
+
+    @rx.event(background=True)
+    async def prefetch_next_patients(self):
+        async with self:
+            key = (self.patient_search, self.next_patient_cursor)
+        if not key[1]:
+            return
         try:
-            auth_state = await self.get_state(AuthState)
-            api_client = APIClient(token=auth_state.token)
-            self.patients = await api_client.get_patients()
+            async with self:
+                auth_state = await self.get_state(AuthState)
+                token = auth_state.token
+            page = await APIClient(token=token).get_patients(
+                limit=PATIENT_PAGE_SIZE, cursor=key[1], search=key[0]
+            )
         except (httpx.HTTPError, ValueError) as e:
-            logging.exception(f"Failed to fetch patients: {e}")
-            return rx.toast.error("Could not load patients.")
-        finally:
-            self.is_loading = False
\ No newline at end of file
+            logging.info(f"Prefetching patients failed: {e}")
+            return
+        async with self:
+            if (self.patient_search, self.next_patient_cursor) == key:
+                self._prefetched_patients = {"key": key, "page": page}
+
+    @rx.var
+    def has_previous_patients(self) -> bool:
+        return len(self.patient_cursors) > 0
+
+    @rx.var
+    def has_next_patients(self) -> bool:
+        return self.next_patient_cursor != ""
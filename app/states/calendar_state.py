@@ -2,16 +2,7 @@ import reflex as rx
 from typing import TypedDict, Any
 import logging
 from datetime import datetime, timedelta, date
-
-
-class Slot(TypedDict):
-    id: int
-    provider_id: int
-    start_datetime: str
-    end_datetime: str
-    price_cents: int
-    is_booked: bool
-    calendar_month: str
+from app.states.slot_store import Slot, SlotStore, SlotView, slot_registry
 
 
 class AvailabilityTemplate(TypedDict):
@@ -25,12 +16,17 @@ class CalendarDay(TypedDict):
     date_str: str
     date_num: str
     is_current_month: bool
-    slots: list[Slot]
+    slots: list[SlotView]
 
 
 class CalendarState(rx.State):
-    slots: list[Slot] = []
-    availability_configs: dict[int, dict[str, AvailabilityTemplate]] = {}
+    """Calendar page state.
+
+    Generated slots and templates live in the process-wide ``slot_registry``
+    keyed by client token, so only the visible month's grid is part of the
+    serialized session.
+    """
+
     selected_provider_id: int = 1
     selected_month: datetime = datetime.now().replace(day=1)
     show_availability_modal: bool = False
@@ -44,10 +40,12 @@ class CalendarState(rx.State):
     is_loading: bool = False
     error_message: str = ""
     _slot_counter: int = 0
+    _slot_version: int = 0
 
     @rx.event
     def on_load(self):
         self.selected_month = datetime.now().replace(day=1)
+        self._slot_version = self._get_slot_store().version
 
     def _validate_month_limit(self, month_dt: datetime) -> bool:
         limit_date = (datetime.now().replace(day=1) + timedelta(days=31 * 6)).replace(
@@ -55,19 +53,25 @@ class CalendarState(rx.State):
         )
         return month_dt < limit_date
 
+    def _get_slot_store(self) -> SlotStore:
+        return slot_registry.get(self.router.session.client_token)
+
     def _slot_exists(self, provider_id: int, start_datetime: datetime) -> bool:
-        return any(
-            (
-                s["provider_id"] == provider_id
-                and s["start_datetime"] == start_datetime.isoformat()
-                for s in self.slots
-            )
+        return self._get_slot_store().exists(provider_id, start_datetime.isoformat())
+
+    def _log_state_size(self) -> None:
+        logging.info(
+            "Calendar session state is %d bytes serialized; slot registry: %s",
+            len(self._serialize()),
+            slot_registry.stats(),
         )
 
     def _generate_time_slots(
         self, date_obj: date, template: AvailabilityTemplate, provider_id: int
     ) -> list[Slot]:
         generated_slots = []
+        slot_counter = self._slot_counter
+        store = self._get_slot_store()
         try:
             start_time_obj = datetime.strptime(template["start_time"], "%H:%M").time()
             end_time_obj = datetime.strptime(template["end_time"], "%H:%M").time()
@@ -79,11 +83,11 @@ class CalendarState(rx.State):
             self.error_message = "Invalid time or duration format in template."
             return []
         while current_time + duration <= end_of_day:
-            if not self._slot_exists(provider_id, current_time):
-                self._slot_counter += 1
+            if not store.exists(provider_id, current_time.isoformat()):
+                slot_counter += 1
                 generated_slots.append(
                     {
-                        "id": self._slot_counter,
+                        "id": slot_counter,
                         "provider_id": provider_id,
                         "start_datetime": current_time.isoformat(),
                         "end_datetime": (current_time + duration).isoformat(),
@@ -93,6 +97,7 @@ class CalendarState(rx.State):
                     }
                 )
             current_time += duration
+        self._slot_counter = slot_counter
         return generated_slots
 
     @rx.event
@@ -107,13 +112,8 @@ class CalendarState(rx.State):
             self.is_loading = False
             return rx.toast.error(self.error_message)
         month_str = month_dt.strftime("%Y-%m")
-        self.slots = [
-            s
-            for s in self.slots
-            if not (
-                s["provider_id"] == provider_id and s["calendar_month"] == month_str
-            )
-        ]
+        store = self._get_slot_store()
+        store.clear_month(provider_id, month_str)
         new_slots = []
         current_date = month_dt
         while current_date.month == month_dt.month:
@@ -123,10 +123,12 @@ class CalendarState(rx.State):
                 )
                 new_slots.extend(day_slots)
             current_date += timedelta(days=1)
-        self.slots.extend(new_slots)
+        store.add_many(new_slots)
+        self._slot_version = store.version
         self.update_availability_template(provider_id, month_str, template)
         self.is_loading = False
         self.show_availability_modal = False
+        self._log_state_size()
 
     @rx.event
     def change_month(self, delta: int):
@@ -163,9 +165,7 @@ class CalendarState(rx.State):
     def update_availability_template(
         self, provider_id: int, month: str, template: AvailabilityTemplate
     ):
-        if provider_id not in self.availability_configs:
-            self.availability_configs[provider_id] = {}
-        self.availability_configs[provider_id][month] = template
+        self._get_slot_store().set_template(provider_id, month, template)
 
     @rx.event
     def set_selected_provider_id(self, provider_id_str: str):
@@ -184,27 +184,37 @@ class CalendarState(rx.State):
     def selected_month_str(self) -> str:
         return self.selected_month.strftime("%B %Y")
 
-    @rx.var
+    @rx.var(
+        deps=["selected_provider_id", "selected_month", "_slot_version"],
+        auto_deps=False,
+    )
     def calendar_grid(self) -> list[CalendarDay]:
+        """The 6-week grid of the selected month for the selected provider.
+
+        Only recomputed when the provider, the month or the generated slots
+        change; days are looked up in the store's per-day index.
+        """
         first_day_of_month = self.selected_month.replace(day=1)
         start_day = first_day_of_month - timedelta(
             days=(first_day_of_month.weekday() + 1) % 7
         )
+        store = self._get_slot_store()
+        days_by_month: dict[str, dict[str, list[SlotView]]] = {}
         grid = []
         current_day = start_day
         for _ in range(42):
-            day_slots = [
-                s
-                for s in self.slots
-                if s["provider_id"] == self.selected_provider_id
-                and s["start_datetime"].startswith(current_day.strftime("%Y-%m-%d"))
-            ]
+            date_str = current_day.date().isoformat()
+            month = date_str[:7]
+            if month not in days_by_month:
+                days_by_month[month] = store.day_index(
+                    self.selected_provider_id, month
+                )
             grid.append(
                 {
-                    "date_str": current_day.strftime("%Y-%m-%d"),
-                    "date_num": current_day.strftime("%d"),
+                    "date_str": date_str,
+                    "date_num": f"{current_day.day:02d}",
                     "is_current_month": current_day.month == self.selected_month.month,
-                    "slots": sorted(day_slots, key=lambda x: x["start_datetime"]),
+                    "slots": days_by_month[month].get(date_str, []),
                 }
             )
             current_day += timedelta(days=1)
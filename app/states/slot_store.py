@@ -0,0 +1,141 @@
+"""Backend-side storage for generated calendar slots.
+
+Stores live in this process only. Run the frontend with a single worker, or
+with sessions pinned to a worker: a session whose store was evicted, lost to
+a restart or is served by another worker sees an empty calendar until the
+slots are generated again.
+"""
+
+import itertools
+import os
+import threading
+import time
+from typing import Iterator, TypedDict
+from cachetools import LRUCache
+
+SLOT_STORE_MAX_SESSIONS = int(os.getenv("SLOT_STORE_MAX_SESSIONS", "1000"))
+_versions = itertools.count(time.time_ns())
+
+
+class Slot(TypedDict):
+    id: int
+    provider_id: int
+    start_datetime: str
+    end_datetime: str
+    price_cents: int
+    is_booked: bool
+    calendar_month: str
+
+
+class SlotView(TypedDict):
+    """The fields of a slot the calendar page renders"""
+
+    id: int
+    start_datetime: str
+    end_datetime: str
+    is_booked: bool
+
+
+class SlotStore:
+    """Generated calendar slots indexed by provider, month and start time.
+
+    Slots live in ``{(provider_id, "YYYY-MM"): {start_datetime: slot}}``, so
+    an existence check, an insert and the replacement of one provider-month
+    each touch a single bucket instead of scanning every slot. ``version``
+    changes on every mutation so views derived from the store can be cached.
+    Versions come from one process-wide counter seeded with the clock, so a
+    store recreated for a session never repeats a version of the one it
+    replaces.
+    """
+
+    def __init__(self):
+        self._months: dict[tuple[int, str], dict[str, Slot]] = {}
+        self._days: dict[tuple[int, str], dict[str, list[SlotView]]] = {}
+        self._templates: dict[tuple[int, str], dict] = {}
+        self.version = next(_versions)
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._months.values())
+
+    def __iter__(self) -> Iterator[Slot]:
+        for bucket in self._months.values():
+            yield from bucket.values()
+
+    def exists(self, provider_id: int, start_datetime: str) -> bool:
+        bucket = self._months.get((provider_id, start_datetime[:7]))
+        return bucket is not None and start_datetime in bucket
+
+    def add(self, slot: Slot) -> None:
+        key = (slot["provider_id"], slot["calendar_month"])
+        self._months.setdefault(key, {})[slot["start_datetime"]] = slot
+        self._days.pop(key, None)
+        self.version = next(_versions)
+
+    def add_many(self, slots: list[Slot]) -> None:
+        for slot in slots:
+            self.add(slot)
+
+    def clear_month(self, provider_id: int, month: str) -> None:
+        self._months.pop((provider_id, month), None)
+        self._days.pop((provider_id, month), None)
+        self.version = next(_versions)
+
+    def day_index(self, provider_id: int, month: str) -> dict[str, list[SlotView]]:
+        """Views of one provider-month's slots by "YYYY-MM-DD", sorted by start.
+
+        Built in a single pass over the month bucket and kept until the bucket
+        changes.
+        """
+        key = (provider_id, month)
+        days = self._days.get(key)
+        if days is None:
+            days = {}
+            bucket = self._months.get(key, {})
+            for start in sorted(bucket):
+                slot = bucket[start]
+                days.setdefault(start[:10], []).append(
+                    {
+                        "id": slot["id"],
+                        "start_datetime": start,
+                        "end_datetime": slot["end_datetime"],
+                        "is_booked": slot["is_booked"],
+                    }
+                )
+            self._days[key] = days
+        return days
+
+    def set_template(self, provider_id: int, month: str, template: dict) -> None:
+        self._templates[(provider_id, month)] = dict(template)
+
+
+class SlotRegistry:
+    """Process-wide slot stores keyed by Reflex client token.
+
+    Keeping generated slots here instead of in ``rx.State`` means Reflex never
+    serializes, diffs or ships them; a session only carries the small view of
+    the visible month. Least recently used sessions are evicted beyond
+    ``max_sessions``.
+    """
+
+    def __init__(self, max_sessions: int):
+        self._stores: LRUCache = LRUCache(maxsize=max_sessions)
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> SlotStore:
+        with self._lock:
+            store = self._stores.get(session_id)
+            if store is None:
+                store = self._stores[session_id] = SlotStore()
+            return store
+
+    def stats(self) -> dict:
+        with self._lock:
+            stores = list(self._stores.values())
+        return {
+            "sessions": len(stores),
+            "max_sessions": self._stores.maxsize,
+            "slots": sum(len(store) for store in stores),
+        }
+
+
+slot_registry = SlotRegistry(max_sessions=SLOT_STORE_MAX_SESSIONS)